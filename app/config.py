@@ -33,6 +33,9 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAIORG_ID: str = os.getenv("OPENAIORG_ID", "")
     
+    STT_BACKEND: str = "openai"  # openai, local
+    LOCAL_WHISPER_MODEL: str = "base"
+    
     TWILIO_API_KEY: str = ""
     TWILIO_API_SECRET: str = ""
     TWILIO_SID_KEY: str = os.environ.get("TWILIO_SID_KEY", "")
@@ -88,6 +91,15 @@ class Settings(BaseSettings):
             raise ValueError(f"STORAGE_TYPE must be one of {allowed_types}")
         return v
     
+    @field_validator("STT_BACKEND")
+    @classmethod
+    def validate_stt_backend(cls, v):
+        """Ensure STT_BACKEND is valid."""
+        allowed_backends = ["openai", "local"]
+        if v not in allowed_backends:
+            raise ValueError(f"STT_BACKEND must be one of {allowed_backends}")
+        return v
+    
     @field_validator("OPENAI_API_KEY")
     @classmethod
     def validate_openai_key(cls, v):
@@ -150,4 +162,19 @@ def get_openai_client_params():
     if settings.OPENAIORG_ID is not None:
         params["organization"] = settings.OPENAIORG_ID
         
-    return params
\ No newline at end of file
+    return params
+
+@lru_cache()
+def get_openai_client():
+    """
+    Create and cache the OpenAI client.
+    
+    Reusing one client keeps its connection pool and TLS sessions warm
+    instead of rebuilding them for every request.
+    
+    Returns:
+        openai.OpenAI: Shared OpenAI client
+    """
+    import openai
+    
+    return openai.OpenAI(**get_openai_client_params())
@@ -1,20 +1,96 @@
 import asyncio
 import logging
+import threading
 import time
 import uuid
 from typing import Dict, List, Any, Optional, AsyncGenerator
 import json
+from contextlib import aclosing
+from functools import lru_cache
 from pathlib import Path
-import openai
 from sqlalchemy.orm import Session
 
-from app.config import settings
+from app.config import settings, get_openai_client
 from app.core.prompt_manager import PromptManager
 from app.voice.stt import transcribe_audio_stream
 from app.voice.tts import synthesize_speech_stream
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on audio coalesced into one WebSocket frame. Audio already sent cannot be
+# recalled on barge-in, so this stays at two 4 KB TTS chunks (well under half a second of MP3)
+RESPONSE_FRAME_MAX_BYTES = 8 * 1024
+
+@lru_cache()
+def get_shared_prompt_manager() -> PromptManager:
+    """Create and cache the prompt manager shared by all agents."""
+    return PromptManager()
+
+@lru_cache()
+def get_system_prompt() -> str:
+    """Render and cache the system prompt shared by all agents."""
+    return get_shared_prompt_manager().get_system_prompt()
+
+@lru_cache()
+def get_shared_openai_client():
+    """Create and cache the OpenAI client shared by all agents."""
+    if not settings.OPENAI_API_KEY:
+        logger.warning("No OpenAI API key found, using mock client")
+        from tests.mocks.mock_openai import MockOpenAIClient
+        return MockOpenAIClient()
+    
+    return get_openai_client()
+
+async def read_stream_in_thread(stream) -> AsyncGenerator[Any, None]:
+    """
+    Yield items from a blocking iterator that is drained by one worker thread.
+    
+    The thread hands each item to the event loop as it arrives, so reading a
+    completion stream costs one thread instead of an executor round-trip per
+    token. Closing the generator (e.g. after an interruption) closes the stream.
+    
+    Args:
+        stream: Blocking iterable, such as a synchronous OpenAI completion stream
+    
+    Yields:
+        Items of the stream, in order
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+    error = None
+    
+    def hand_over(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop has shut down; nobody is waiting for the rest
+            pass
+    
+    def drain():
+        nonlocal error
+        try:
+            for item in stream:
+                hand_over(item)
+        except Exception as e:
+            error = e
+        finally:
+            hand_over(done)
+    
+    threading.Thread(target=drain, name="completion-stream", daemon=True).start()
+    try:
+        while (item := await queue.get()) is not done:
+            yield item
+        if error is not None:
+            raise error
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing completion stream: {str(e)}")
+
 class StreamingAgent:
     """Agent for streaming voice interactions."""
     
@@ -26,7 +102,7 @@ class StreamingAgent:
             db_session: Database session
         """
         self.db_session = db_session
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = get_shared_prompt_manager()
         
         # Streaming state
         self.conversation_id = f"conv_{uuid.uuid4().hex}"
@@ -36,28 +112,15 @@ class StreamingAgent:
         self.response_queue = asyncio.Queue()
         
         # OpenAI client
-        self.openai_client = self._initialize_openai()
+        self.openai_client = get_shared_openai_client()
         
         # System prompt
         self.messages = [
-            {"role": "system", "content": self.prompt_manager.get_system_prompt()}
+            {"role": "system", "content": get_system_prompt()}
         ]
         
         logger.info(f"Streaming agent initialized with conversation ID: {self.conversation_id}")
     
-    def _initialize_openai(self):
-        """Initialize OpenAI client."""
-        if not settings.OPENAI_API_KEY:
-            logger.warning("No OpenAI API key found, using mock client")
-            from tests.mocks.mock_openai import MockOpenAIClient
-            return MockOpenAIClient()
-        
-        client_params = {"api_key": settings.OPENAI_API_KEY}
-        if settings.OPENAIORG_ID:
-            client_params["organization"] = settings.OPENAIORG_ID
-        
-        return openai.OpenAI(**client_params)
-    
     async def process_audio(self, audio_data: bytes) -> str:
         """
         Process audio input and generate a response.
@@ -96,7 +159,10 @@ class StreamingAgent:
             # Generate streaming response
             logger.info(f"Creating OpenAI chat completion with {len(self.messages)} messages")
             try:
-                stream = self.openai_client.chat.completions.create(
+                # The client is synchronous; create and read the stream off the event loop
+                # so queued audio keeps flowing to the caller while tokens arrive
+                stream = await asyncio.to_thread(
+                    self.openai_client.chat.completions.create,
                     model="gpt-4o-mini",
                     messages=self.messages,
                     stream=True
@@ -107,38 +173,40 @@ class StreamingAgent:
                 chunk_text = ""
                 
                 logger.info("Processing response stream")
-                for chunk in stream:
-                    if self.should_interrupt:
-                        logger.info("Response interrupted by user")
-                        break
-                    
-                    # Extract content from chunk
-                    if hasattr(chunk.choices[0], 'delta') and chunk.choices[0].delta.content:
-                        delta_content = chunk.choices[0].delta.content
-                        chunk_text += delta_content
-                        logger.debug(f"Received chunk: {delta_content}")
+                # Leaving the block, including on interruption, closes the stream
+                async with aclosing(read_stream_in_thread(stream)) as chunks:
+                    async for chunk in chunks:
+                        if self.should_interrupt:
+                            logger.info("Response interrupted by user")
+                            break
                         
-                        # Process in sentence-sized chunks for more natural TTS
-                        if any(punct in chunk_text for punct in ['.', '?', '!']):
-                            full_response += chunk_text
-                            logger.info(f"Processing sentence: {chunk_text}")
+                        # Extract content from chunk
+                        if hasattr(chunk.choices[0], 'delta') and chunk.choices[0].delta.content:
+                            delta_content = chunk.choices[0].delta.content
+                            chunk_text += delta_content
+                            logger.debug(f"Received chunk: {delta_content}")
                             
-                            # Save partial transcript
-                            with open(f"storage/transcripts/{self.conversation_id}_partial.txt", "a") as f:
-                                f.write(f"AI: {chunk_text}\n")
-                            
-                            # Generate audio for this chunk
-                            audio_chunks = await synthesize_speech_stream(chunk_text, self.openai_client)
-                            logger.info(f"Generated {len(audio_chunks)} audio chunks")
-                            
-                            # Queue audio chunks for sending
-                            for audio_chunk in audio_chunks:
-                                if self.should_interrupt:
-                                    break
-                                await self.response_queue.put(audio_chunk)
-                            
-                            # Reset chunk text
-                            chunk_text = ""
+                            # Process in sentence-sized chunks for more natural TTS
+                            if any(punct in chunk_text for punct in ['.', '?', '!']):
+                                full_response += chunk_text
+                                logger.info(f"Processing sentence: {chunk_text}")
+                                
+                                # Save partial transcript
+                                with open(f"storage/transcripts/{self.conversation_id}_partial.txt", "a") as f:
+                                    f.write(f"AI: {chunk_text}\n")
+                                
+                                # Generate audio for this chunk
+                                audio_chunks = await synthesize_speech_stream(chunk_text, self.openai_client)
+                                logger.info(f"Generated {len(audio_chunks)} audio chunks")
+                                
+                                # Queue audio chunks for sending
+                                for audio_chunk in audio_chunks:
+                                    if self.should_interrupt:
+                                        break
+                                    await self.response_queue.put(audio_chunk)
+                                
+                                # Reset chunk text
+                                chunk_text = ""
                 
                 # Process any remaining text
                 if chunk_text and not self.should_interrupt:
@@ -198,6 +266,9 @@ class StreamingAgent:
         """
         Get streaming audio response.
         
+        Chunks that are already queued are coalesced (up to RESPONSE_FRAME_MAX_BYTES)
+        so the caller sends fewer, larger frames.
+        
         Yields:
             Audio chunks
         """
@@ -207,7 +278,22 @@ class StreamingAgent:
             if chunk is None:
                 break
             
-            yield chunk
+            # Drain whatever TTS has already queued without waiting for more
+            chunks = [chunk]
+            size = len(chunk)
+            finished = False
+            while size < RESPONSE_FRAME_MAX_BYTES and not self.response_queue.empty():
+                chunk = self.response_queue.get_nowait()
+                if chunk is None:
+                    finished = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            
+            yield chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            
+            if finished:
+                break
     
     async def handle_interruption(self):
         """Handle user interruption."""
@@ -4,7 +4,7 @@ Status endpoints for health checking and monitoring.
 import time
 from fastapi import APIRouter, Response, status
 from pydantic import BaseModel
-from app.config import settings
+from app.config import settings, get_openai_client
 
 router = APIRouter()
 
@@ -46,13 +46,8 @@ async def test_openai():
         return {"status": "error", "message": "No OpenAI API key configured"}
     
     try:
-        import openai
-
-        client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY, 
-            organization=settings.OPENAIORG_ID
-        )
-
+        client = get_openai_client()
+        
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "which model am i talking to?"}],
@@ -86,9 +81,9 @@ async def test_twilio():
     
     try:
         import datetime
-        from app.utils.twilio_client import create_twilio_client
+        from app.utils.twilio_client import get_twilio_client
         
-        client = create_twilio_client()
+        client = get_twilio_client()
         if not client:
             return {
                 "status": "error",
@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional
+from datetime import datetime
 from sqlalchemy.orm import Session
 from database.models import MenuCategory, MenuItem, DietaryRestriction, DietaryRestrictionType
 from database.repository import MenuCategoryRepository, MenuItemRepository
@@ -22,13 +23,14 @@ def get_menu_items_by_category(db: Session, category_id: int) -> List[Dict[str,
     """Get menu items by category."""
     repo = MenuItemRepository(db)
     items = repo.get_by_category(category_id)
+    now = datetime.now()
     
     return [
         {
             "id": item.id,
             "name": item.name,
             "description": item.description,
-            "price": item.get_current_price(),
+            "price": item.get_current_price(now),
             "dietary_restrictions": [dr.restriction_type.value for dr in item.dietary_restrictions]
         }
         for item in items
@@ -39,13 +41,14 @@ def search_menu_items(db: Session, query: str) -> List[Dict[str, Any]]:
     """Search for menu items."""
     repo = MenuItemRepository(db)
     items = repo.search_by_name(query)
+    now = datetime.now()
     
     return [
         {
             "id": item.id,
             "name": item.name,
             "description": item.description,
-            "price": item.get_current_price(),
+            "price": item.get_current_price(now),
             "category": item.category.name
         }
         for item in items
@@ -64,13 +67,14 @@ def get_menu_items_by_dietary_restriction(
     
     repo = MenuItemRepository(db)
     items = repo.get_by_dietary_restriction(enum_type)
+    now = datetime.now()
     
     return [
         {
             "id": item.id,
             "name": item.name,
             "description": item.description,
-            "price": item.get_current_price(),
+            "price": item.get_current_price(now),
             "category": item.category.name
         }
         for item in items
@@ -85,11 +89,12 @@ def get_menu_item_details(db: Session, item_id: int) -> Optional[Dict[str, Any]]
     if not item:
         return None
     
+    now = datetime.now()
     return {
         "id": item.id,
         "name": item.name,
         "description": item.description,
-        "price": item.get_current_price(),
+        "price": item.get_current_price(now),
         "category": item.category.name,
         "dietary_restrictions": [dr.restriction_type.value for dr in item.dietary_restrictions],
         "ingredients": [ingredient.name for ingredient in item.ingredients],
@@ -100,6 +105,6 @@ def get_menu_item_details(db: Session, item_id: int) -> Optional[Dict[str, Any]]
                 "end_date": sp.end_date.isoformat()
             }
             for sp in item.special_prices
-            if sp.is_active()
+            if sp.is_active(now)
         ]
     }
\ No newline at end of file
@@ -1,8 +1,12 @@
 from typing import List, Dict, Any, Optional
+from datetime import datetime
+import numpy as np
 from sqlalchemy.orm import Session
 from database.models import MenuItem, SpecialPricing
 from database.repository import MenuItemRepository, SpecialPricingRepository
 
+TAX_RATE = 0.085
+
 def get_item_price(db: Session, item_id: int) -> Optional[Dict[str, Any]]:
     """
     Get price information for a menu item.
@@ -87,40 +91,41 @@ def calculate_order_total(db: Session, items: List[Dict[str, Any]]) -> Dict[str,
         Order total information
     """
     repo = MenuItemRepository(db)
-    
-    order_items = []
-    subtotal = 0.0
-    
-    for item_data in items:
-        item_id = item_data["id"]
-        quantity = item_data.get("quantity", 1)
-        
-        item = repo.get_by_id(item_id)
-        if not item:
-            continue
-        
-        current_price = item.get_current_price()
-        item_total = current_price * quantity
-        
-        order_items.append({
+    menu_items = {item.id: item for item in repo.get_by_ids([item_data["id"] for item_data in items])}
+    
+    # Skip unknown items, keeping the order of the request
+    lines = [
+        (menu_items[item_data["id"]], item_data.get("quantity", 1))
+        for item_data in items
+        if item_data["id"] in menu_items
+    ]
+    
+    count = len(lines)
+    now = datetime.now()
+    prices = np.fromiter((item.get_current_price(now) for item, _ in lines), dtype=np.float64, count=count)
+    quantities = np.fromiter((quantity for _, quantity in lines), dtype=np.float64, count=count)
+    line_totals = prices * quantities
+    
+    order_items = [
+        {
             "id": item.id,
             "name": item.name,
-            "price": current_price,
+            "price": float(price),
             "quantity": quantity,
-            "total": item_total
-        })
-        
-        subtotal += item_total
+            "total": float(line_total)
+        }
+        for (item, quantity), price, line_total in zip(lines, prices, line_totals)
+    ]
     
-    tax_rate = 0.085
-    tax = subtotal * tax_rate
+    subtotal = float(line_totals.sum())
+    tax = subtotal * TAX_RATE
     
     total = subtotal + tax
     
     return {
         "items": order_items,
         "subtotal": subtotal,
-        "tax_rate": tax_rate,
+        "tax_rate": TAX_RATE,
         "tax": tax,
         "total": total
     }
\ No newline at end of file
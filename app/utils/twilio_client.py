@@ -2,6 +2,7 @@
 Twilio client utilities for Voice AI Restaurant Agent.
 """
 import logging
+from functools import lru_cache
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException, TwilioException
 from app.config import settings
@@ -29,6 +30,16 @@ def create_twilio_client():
     logger.warning("Missing Twilio API credentials")
     return None
 
+@lru_cache()
+def get_twilio_client():
+    """
+    Create and cache the Twilio client.
+    
+    The client's HTTP session pools connections, so reusing it keeps TCP and
+    TLS connections to the Twilio API alive between requests.
+    """
+    return create_twilio_client()
+
 def send_sms(to_number, from_number, message):
     """
     Send an SMS message using Twilio.
@@ -41,7 +52,7 @@ def send_sms(to_number, from_number, message):
     Returns:
         dict: Message details if successful, error details if failed
     """
-    client = create_twilio_client()
+    client = get_twilio_client()
     if not client:
         return {"status": "error", "message": "Twilio client initialization failed"}
     
@@ -1,10 +1,12 @@
 """
 Audio streaming module for bidirectional voice communication.
 """
+import os
 import asyncio
 import logging
+import struct
 import time
-from typing import Dict, List, Optional, Callable, Any, AsyncGenerator
+from typing import Dict, Optional, Callable, Any, AsyncGenerator
 import numpy as np
 from fastapi import WebSocket, WebSocketDisconnect
 from pathlib import Path
@@ -13,45 +15,97 @@ from app.voice.vad import InterruptionDetector
 
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
+# Frame length advertised to clients. 90 ms frames keep WebSocket message
+# overhead low without adding noticeable latency. It must stay a multiple of
+# the VAD's 30 ms window: the VAD splits each frame into whole windows and
+# drops any remainder.
+CLIENT_FRAME_MS = 90
+
 class AudioBuffer:
-    """Buffer for audio streaming."""
+    """Fixed-capacity ring buffer for audio streaming."""
     
-    def __init__(self, max_size: int = 10):
+    def __init__(self, max_size: int = 10, sample_rate: int = SAMPLE_RATE, sample_width: int = 2):
         """
         Initialize the audio buffer.
         
         Args:
             max_size: Maximum buffer size in seconds
+            sample_rate: Audio sample rate in Hz
+            sample_width: Bytes per sample
         """
-        self.buffer: List[bytes] = []
         self.max_size = max_size
+        self.capacity = max_size * sample_rate * sample_width
+        
+        # Preallocated once; chunks are copied in place instead of growing a list.
+        # Audio starts at _start and may wrap around the end of the storage.
+        self._data = bytearray(self.capacity)
+        self._view = memoryview(self._data)
+        self._start = 0
         self.current_size = 0
     
     def add(self, chunk: bytes):
-        """Add audio chunk to buffer."""
-        self.buffer.append(chunk)
-        self.current_size += len(chunk)
-        
-        # Trim buffer if it gets too large
-        while self.current_size > self.max_size and self.buffer:
-            removed = self.buffer.pop(0)
-            self.current_size -= len(removed)
+        """Add audio chunk to buffer, dropping the oldest audio when full."""
+        chunk = memoryview(chunk)
+        size = len(chunk)
+        if size >= self.capacity:
+            self._view[:] = chunk[size - self.capacity:]
+            self._start = 0
+            self.current_size = self.capacity
+            return
+        
+        # Drop the oldest bytes by advancing the start, without moving any data
+        overflow = self.current_size + size - self.capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % self.capacity
+            self.current_size -= overflow
+        
+        # Write at the end, wrapping to the front of the storage if needed
+        end = (self._start + self.current_size) % self.capacity
+        first = min(size, self.capacity - end)
+        self._view[end:end + first] = chunk[:first]
+        self._view[:size - first] = chunk[first:]
+        self.current_size += size
     
     def get_all(self) -> bytes:
         """Get all audio data from buffer and clear it."""
-        if not self.buffer:
-            return b''
-        
-        result = b''.join(self.buffer)
-        self.buffer = []
-        self.current_size = 0
+        end = self._start + self.current_size
+        if end <= self.capacity:
+            result = self._view[self._start:end].tobytes()
+        else:
+            result = b"".join((self._view[self._start:], self._view[:end - self.capacity]))
+        self.clear()
         return result
     
     def clear(self):
         """Clear the buffer."""
-        self.buffer = []
+        self._start = 0
         self.current_size = 0
 
+# RIFF/WAVE header layout for PCM: RIFF chunk, 16-byte fmt chunk, data chunk header
+WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+def wav_header(data_size: int, sample_rate: int = SAMPLE_RATE, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Build the 44-byte RIFF/WAVE header for PCM data.
+    
+    Args:
+        data_size: Size of the PCM data in bytes
+        sample_rate: Audio sample rate in Hz
+        channels: Number of channels
+        sample_width: Bytes per sample
+    
+    Returns:
+        Header bytes to write before the PCM data
+    """
+    block_align = channels * sample_width
+    return WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 8 * sample_width,
+        b"data", data_size
+    )
+
 class StreamManager:
     """Manager for audio streaming connections."""
     
@@ -85,9 +139,9 @@ class StreamManager:
         await websocket.send_json({
             "event": "connected",
             "config": {
-                "sample_rate": 16000,
+                "sample_rate": SAMPLE_RATE,
                 "channels": 1,
-                "frame_size": 480  # 30ms at 16kHz
+                "frame_size": SAMPLE_RATE * CLIENT_FRAME_MS // 1000  # samples per frame
             }
         })
     
@@ -157,6 +211,27 @@ class StreamManager:
         except Exception as e:
             logger.error(f"Error sending audio to {client_id}: {str(e)}")
     
+    async def send_event(self, client_id: str, event: Dict[str, Any]):
+        """
+        Send a JSON control event to client.
+        
+        Args:
+            client_id: Client identifier
+            event: Event payload
+        """
+        if client_id not in self.active_connections:
+            logger.warning(f"Cannot send event to unknown client: {client_id}")
+            return
+        
+        websocket = self.active_connections[client_id]
+        try:
+            await websocket.send_json(event)
+        except WebSocketDisconnect:
+            logger.info(f"Client {client_id} disconnected during send")
+            self.disconnect(client_id)
+        except Exception as e:
+            logger.error(f"Error sending event to {client_id}: {str(e)}")
+    
     def register_interrupt_handler(self, client_id: str, handler: Callable):
         """
         Register handler for interruptions.
@@ -201,11 +276,20 @@ class StreamManager:
                     pass
             self.disconnect(client_id)
     def save_audio_file(self, client_id: str, file_type: str, data: bytes) -> str:
-        """Save audio data as proper WAV file."""
+        """
+        Save audio data as proper WAV file.
+        
+        Args:
+            client_id: Client identifier
+            file_type: Label used in the filename (e.g. "input" or "output")
+            data: WAV file bytes or raw 16-bit mono PCM (any bytes-like object
+                is written without copying)
+        
+        Returns:
+            Path of the saved file
+        """
         from pathlib import Path
         import time
-        import wave
-        import io
         
         timestamp = int(time.time())
         directory = Path("storage/audio")
@@ -220,12 +304,18 @@ class StreamManager:
             with open(filepath, "wb") as f:
                 f.write(data)
         else:
-            # Create a proper WAV file from raw PCM
-            with wave.open(str(filepath), 'wb') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(16000)  # 16kHz
-                wav_file.writeframes(data)
+            # Create a proper WAV file from raw PCM (16 kHz, 16-bit mono) with the
+            # header sized up front, so there is no seek back to patch it. writev
+            # sends header and data in one syscall without joining them first.
+            header = wav_header(len(data))
+            with open(filepath, "wb", buffering=0) as f:
+                if hasattr(os, "writev"):
+                    written = os.writev(f.fileno(), [header, data])
+                    if written < len(header) + len(data):
+                        f.write(memoryview(header + bytes(data))[written:])
+                else:
+                    f.write(header)
+                    f.write(data)
         
         logger.info(f"Saved {file_type} audio ({len(data)} bytes) to {filepath}")
         return str(filepath)
@@ -1,17 +1,59 @@
 """
 Speech-to-Text module with streaming support.
 """
+import io
 import logging
-import os
-import tempfile
 import asyncio
+import threading
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, AsyncGenerator
-import openai
 
-from app.config import settings
+from app.config import settings, get_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Clips are short, so a small batch keeps memory flat while still using the batched decoder
+LOCAL_WHISPER_BATCH_SIZE = 8
+
+# Serializes the first load, so concurrent calls do not each load their own copy of the model
+_local_whisper_lock = threading.Lock()
+
+@lru_cache()
+def get_local_whisper_pipeline():
+    """
+    Load and cache the local faster-whisper pipeline.
+    
+    The model is loaded once per process so every transcription reuses it.
+    A failed load is cached as None too, so it is not retried on every call.
+    
+    Returns:
+        BatchedInferencePipeline, or None if faster-whisper is not installed
+        or the model cannot be loaded
+    """
+    try:
+        from faster_whisper import WhisperModel, BatchedInferencePipeline
+    except ImportError:
+        logger.warning("faster-whisper not installed, local STT unavailable")
+        return None
+    
+    try:
+        model = WhisperModel(settings.LOCAL_WHISPER_MODEL, device="cuda", compute_type="float16")
+    except Exception as e:
+        logger.info(f"CUDA unavailable for local Whisper ({str(e)}), using CPU")
+        try:
+            model = WhisperModel(settings.LOCAL_WHISPER_MODEL, device="cpu", compute_type="int8")
+        except Exception as e:
+            logger.error(f"Could not load local Whisper model {settings.LOCAL_WHISPER_MODEL}: {str(e)}")
+            return None
+    
+    logger.info(f"Loaded local Whisper model: {settings.LOCAL_WHISPER_MODEL}")
+    return BatchedInferencePipeline(model=model)
+
+def _load_local_whisper_pipeline():
+    """Blocking, thread-safe access to the cached local Whisper pipeline."""
+    with _local_whisper_lock:
+        return get_local_whisper_pipeline()
+
 async def transcribe_audio_stream(audio_data: bytes, client: Optional[Any] = None) -> str:
     """
     Transcribe audio data using OpenAI Whisper API with streaming support.
@@ -26,39 +68,48 @@ async def transcribe_audio_stream(audio_data: bytes, client: Optional[Any] = Non
     if not audio_data:
         return ""
     
+    if settings.STT_BACKEND == "local":
+        try:
+            # The first call loads (and may download) the model, so keep it off the event loop
+            pipeline = await asyncio.to_thread(_load_local_whisper_pipeline)
+            if pipeline is not None:
+                return await asyncio.to_thread(_transcribe_local, pipeline, audio_data)
+        except Exception as e:
+            logger.error(f"Error transcribing audio locally: {str(e)}")
+            return _get_mock_transcription(len(audio_data))
+    
     if client is None:
         if not settings.OPENAI_API_KEY:
             logger.warning("No OpenAI API key, using mock transcription")
             return _get_mock_transcription(len(audio_data))
             
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
     
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(audio_data)
-        
-        with open(temp_file_path, "rb") as audio_file:
-            response = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text"
-            )
-            
-            transcript = response if isinstance(response, str) else response.text
-            return transcript
+        # The OpenAI client is synchronous; run it in a worker thread so the
+        # event loop keeps serving other calls while the upload is in flight
+        return await asyncio.to_thread(_transcribe, client, audio_data)
     
     except Exception as e:
         logger.error(f"Error transcribing audio: {str(e)}")
         return _get_mock_transcription(len(audio_data))
+
+def _transcribe(client: Any, audio_data: bytes) -> str:
+    """Blocking Whisper call on the in-memory audio."""
+    # Upload the bytes directly; the filename only tells Whisper the format
+    response = client.audio.transcriptions.create(
+        model="whisper-1",
+        file=("audio.wav", audio_data),
+        response_format="text"
+    )
     
-    finally:
-        # Clean up temp file
-        try:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-        except Exception:
-            pass
+    transcript = response if isinstance(response, str) else response.text
+    return transcript
+
+def _transcribe_local(pipeline: Any, audio_data: bytes) -> str:
+    """Blocking local Whisper transcription with no network round-trip."""
+    segments, _ = pipeline.transcribe(io.BytesIO(audio_data), batch_size=LOCAL_WHISPER_BATCH_SIZE)
+    return " ".join(segment.text.strip() for segment in segments)
 
 def _get_mock_transcription(audio_length: int) -> str:
     """Generate mock transcription for testing."""
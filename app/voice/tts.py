@@ -3,12 +3,10 @@ Text-to-Speech module with streaming support.
 """
 import logging
 import base64
-import tempfile
-import os
 import asyncio
+from functools import lru_cache
 from typing import Optional, List, AsyncGenerator, Any
-import openai
-from app.config import settings
+from app.config import settings, get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,69 +34,57 @@ async def synthesize_speech_stream(
     if client is None:
         if not settings.OPENAI_API_KEY:
             logger.info("No OpenAI API key, using mock TTS")
-            return _get_mock_tts_chunks(text, chunk_size)
+            return await asyncio.to_thread(_get_mock_tts_chunks, text, chunk_size)
             
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
     
     try:
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_file:
-            temp_file_path = temp_file.name
-        
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice="nova",
-            input=text
-        )
-        
-        response.stream_to_file(temp_file_path)
-        
-        # Read file in chunks
-        chunks = []
-        with open(temp_file_path, "rb") as f:
-            while chunk := f.read(chunk_size):
-                chunks.append(chunk)
-        
-        return chunks
+        # The OpenAI client is synchronous; run it in a worker thread so the
+        # event loop keeps serving other calls while the request is in flight
+        return await asyncio.to_thread(_synthesize_chunks, client, text, chunk_size)
     
     except Exception as e:
         logger.error(f"Error with OpenAI TTS: {str(e)}")
         logger.info("Falling back to mock TTS")
-        return _get_mock_tts_chunks(text, chunk_size)
+        return await asyncio.to_thread(_get_mock_tts_chunks, text, chunk_size)
+
+def _synthesize_chunks(client: Any, text: str, chunk_size: int) -> List[bytes]:
+    """Blocking OpenAI TTS call that returns the audio split into chunks."""
+    response = client.audio.speech.create(
+        model="tts-1",
+        voice="nova",
+        input=text
+    )
+    
+    # Split the response body in memory rather than round-tripping a temp file
+    audio_content = response.content
+    return [audio_content[i:i + chunk_size] for i in range(0, len(audio_content), chunk_size)]
+
+@lru_cache(maxsize=64)
+def _get_mock_tts_audio(text: str) -> bytes:
+    """Synthesize mock TTS audio with gTTS, cached per text since the output is deterministic."""
+    from gtts import gTTS
+    import io
     
-    finally:
-        # Clean up temp file
-        try:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-        except Exception:
-            pass
+    # Create gTTS object
+    tts = gTTS(text=text, lang='en-us', slow=False)
+    
+    # Save to a buffer
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    return buffer.getvalue()
 
 def _get_mock_tts_chunks(text: str, chunk_size: int) -> List[bytes]:
     """Generate mock TTS audio chunks for testing."""
     try:
-        from gtts import gTTS
-        import io
-        
-        # Create gTTS object
-        tts = gTTS(text=text, lang='en-us', slow=False)
-        
-        # Save to a buffer
-        buffer = io.BytesIO()
-        tts.write_to_fp(buffer)
-        buffer.seek(0)
-        
-        # Get audio content
-        audio_content = buffer.getvalue()
-        
-        # Split into chunks
-        chunks = []
-        for i in range(0, len(audio_content), chunk_size):
-            chunks.append(audio_content[i:i + chunk_size])
-        
-        return chunks
+        # Repeated phrases (welcome, fallback) skip the gTTS round-trip after the first call
+        audio_content = _get_mock_tts_audio(text)
     
     except ImportError:
         logger.warning("gTTS not installed, using silent audio")
         # Generate a simple silent MP3
         silent_mp3 = b'\xFF\xF3\x18\xC4\x00\x00\x00\x03H\x00\x00\x00\x00LAME3.100'
-        return [silent_mp3]
\ No newline at end of file
+        return [silent_mp3]
+    
+    # Split into chunks
+    return [audio_content[i:i + chunk_size] for i in range(0, len(audio_content), chunk_size)]
\ No newline at end of file
@@ -2,9 +2,9 @@
 """
 Twilio Media Streams integration for real-time streaming audio.
 """
-import base64
 import json
 import logging
+from binascii import a2b_base64
 from typing import Dict, Any, Callable, Optional
 from fastapi import WebSocket
 
@@ -78,7 +78,8 @@ class TwilioMediaStreamHandler:
         # Decode audio payload
         try:
             payload = media_chunk.get("payload", "")
-            audio_data = base64.b64decode(payload)
+            # a2b_base64 is the C decoder behind base64.b64decode, without the wrapper overhead per frame
+            audio_data = a2b_base64(payload)
             
             # Process with VAD for interruption detection
             if call_sid in self.vad_detectors:
@@ -120,6 +121,10 @@ class TwilioMediaStreamHandler:
             async for audio_chunk in agent.get_response_stream():
                 if audio_chunk:
                     await self.stream_manager.send_audio(call_sid, audio_chunk)
+            
+            # Tell the client the response is finished so it can stop waiting
+            # as soon as the last chunk arrives instead of sleeping a fixed time
+            await self.stream_manager.send_event(call_sid, {"event": "complete"})
                     
         except Exception as e:
             logger.error(f"Error streaming response: {str(e)}")
\ No newline at end of file
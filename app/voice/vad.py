@@ -63,12 +63,11 @@ class InterruptionDetector:
             # For larger frames, split into multiple WebRTC VAD-compatible frames
             if len(audio_frame) > expected_size:
                 results = []
-                # Process multiple frames
-                for i in range(0, len(audio_frame), expected_size):
-                    frame_chunk = audio_frame[i:i+expected_size]
-                    if len(frame_chunk) == expected_size:
-                        speech, interrupt = self._process_standard_frame(frame_chunk)
-                        results.append((speech, interrupt))
+                # Process multiple frames as zero-copy views; webrtcvad reads them through the buffer protocol
+                view = memoryview(audio_frame)
+                for i in range(0, len(view) - expected_size + 1, expected_size):
+                    speech, interrupt = self._process_standard_frame(view[i:i+expected_size])
+                    results.append((speech, interrupt))
                 
                 # Return True for interruption if any frame detected it
                 return any(r[0] for r in results), any(r[1] for r in results)
@@ -77,7 +76,8 @@ class InterruptionDetector:
                 self._frame_buffer += audio_frame
                 if len(self._frame_buffer) >= expected_size:
                     frame_to_process = self._frame_buffer[:expected_size]
-                    self._frame_buffer = self._frame_buffer[expected_size:]
+                    # Drop the consumed bytes in place rather than copying the remainder
+                    del self._frame_buffer[:expected_size]
                     return self._process_standard_frame(frame_to_process)
                 return False, False
         
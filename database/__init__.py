@@ -4,32 +4,183 @@ Database package for the Voice AI Restaurant Agent.
 
 This module initializes the database connection and provides utilities.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
 from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
 from app.config import settings
+import hashlib
 import logging
+import os
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
+# Named shared-cache database used for in-memory URLs, so every connection sees the same data
+MEMORY_DATABASE_URI = "file:restaurant_db?mode=memory&cache=shared"
+
+# Serialized image of a freshly seeded in-memory database, restored instead of re-seeding
+SEED_SNAPSHOT_PATH = Path.home() / ".cache" / "restaurant_db" / "seed.v1.sqlite"
+
+def _is_memory_sqlite(url) -> bool:
+    """Check whether a database URL points at an in-memory SQLite database."""
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+database_url = settings.DATABASE_URL
+engine_options = {}
+if _is_memory_sqlite(database_url):
+    # A plain :memory: database only exists inside one connection, so point every
+    # connection at one named shared-cache database instead. Each session still gets
+    # its own connection and transaction, but shared cache locks per table: touching a
+    # table that another session has written to but not yet committed fails with
+    # "database table is locked" rather than waiting, so in-memory mode suits tests
+    # and single-user local runs, not concurrent writers.
+    database_url = f"sqlite:///{MEMORY_DATABASE_URI}&uri=true"
+    # SQLAlchemy would otherwise pick SingletonThreadPool, sharing a connection per thread
+    engine_options = {"poolclass": QueuePool}
+    # The database is dropped when its last connection closes; this one lives with the process
+    _memory_keepalive = sqlite3.connect(MEMORY_DATABASE_URI, uri=True, check_same_thread=False)
+
 # Create engine
 engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    database_url,
+    echo=settings.DEBUG and settings.LOG_LEVEL == "DEBUG",
+    connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+    **engine_options
 )
 
+if engine.url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune journaling and fsync for the local SQLite database."""
+        cursor = dbapi_connection.cursor()
+        if _is_memory_sqlite(engine.url):
+            # Nothing outlives the process, so keep the rollback journal in RAM and never sync
+            cursor.execute("PRAGMA journal_mode=MEMORY")
+            cursor.execute("PRAGMA synchronous=OFF")
+        else:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
 # Create session factory
 session_factory = sessionmaker(bind=engine)
 SessionLocal = scoped_session(session_factory)
 
+def _schema_fingerprint() -> str:
+    """Hash the mapped tables and their columns."""
+    from database.models import Base
+    
+    # Columns are included so an added column re-runs create_tables and its upgrade step
+    tables = tuple(sorted((name, tuple(table.columns.keys())) for name, table in Base.metadata.tables.items()))
+    return hashlib.sha256(str(tables).encode("utf-8")).hexdigest()
+
+def _schema_is_initialized() -> bool:
+    """
+    Check whether a previous run already created and seeded this database.
+    
+    The fingerprint lives in the database itself, so a recreated or emptied
+    database is never mistaken for an initialized one.
+    """
+    from database.models import Base
+    from database.schema import schema_meta
+    
+    try:
+        with engine.connect() as conn:
+            stored = conn.execute(
+                select(schema_meta.c.value).where(schema_meta.c.key == "fingerprint")
+            ).scalar()
+            if stored != _schema_fingerprint():
+                return False
+            # Tables dropped after init would otherwise keep their stale fingerprint
+            return set(Base.metadata.tables) <= set(inspect(conn).get_table_names())
+    except SQLAlchemyError:
+        # Most likely no schema_meta table yet
+        return False
+
+def _seed_fingerprint() -> str:
+    """
+    Hash the schema fingerprint with the seed sources and today's date.
+    
+    The seed data is relative to the current date, so a snapshot is only
+    reused on the day it was taken.
+    """
+    package_dir = Path(__file__).parent
+    mtimes = [(package_dir / name).stat().st_mtime_ns for name in ("models.py", "schema.py", "mock_data.py")]
+    key = f"{_schema_fingerprint()}|{mtimes}|{date.today().isoformat()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def _restore_seed_snapshot() -> bool:
+    """Load the seeded in-memory database from its snapshot, if it is current."""
+    try:
+        fingerprint, _, image = SEED_SNAPSHOT_PATH.read_bytes().partition(b"\n")
+        if fingerprint.decode("ascii") != _seed_fingerprint():
+            return False
+    except (OSError, UnicodeDecodeError):
+        return False
+    
+    # Deserializing would detach that one connection from the shared cache, so
+    # load the image into a scratch database and copy it in with the backup API
+    source = sqlite3.connect(":memory:")
+    connection = engine.raw_connection()
+    try:
+        source.deserialize(image)
+        source.backup(connection.driver_connection)
+    finally:
+        connection.close()
+        source.close()
+    return True
+
+def _save_seed_snapshot():
+    """Atomically write the seeded in-memory database to its snapshot."""
+    connection = engine.raw_connection()
+    try:
+        image = connection.driver_connection.serialize()
+    finally:
+        connection.close()
+    
+    try:
+        SEED_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SEED_SNAPSHOT_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(_seed_fingerprint().encode("ascii") + b"\n" + image)
+        os.replace(tmp_path, SEED_SNAPSHOT_PATH)
+    except OSError as e:
+        logger.warning(f"Could not write seed snapshot: {str(e)}")
+
+def _mark_schema_initialized(session):
+    """Record the current schema fingerprint in the database so later runs can skip init."""
+    from database.schema import schema_meta
+    
+    session.execute(delete(schema_meta).where(schema_meta.c.key == "fingerprint"))
+    session.execute(schema_meta.insert().values(key="fingerprint", value=_schema_fingerprint()))
+    session.commit()
+
 # Initialize database
 def init_db():
     """Initialize the database."""
     from database.schema import create_tables
     from database.mock_data import seed_database
     
+    if _schema_is_initialized():
+        logger.info("Database schema already initialized, skipping init.")
+        return
+    
+    in_memory = _is_memory_sqlite(engine.url)
+    if in_memory and _restore_seed_snapshot():
+        logger.info("Database restored from seed snapshot.")
+        return
+    
     logger.info("Initializing database...")
     
     # Create tables
@@ -48,6 +199,11 @@ def init_db():
             logger.info("Database initialized with seed data.")
         else:
             logger.info("Database already contains data, skipping seed operation.")
+        
+        _mark_schema_initialized(session)
+        # Taken after marking, so a restored snapshot also counts as initialized
+        if in_memory and not existing_categories:
+            _save_seed_snapshot()
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         session.rollback()
@@ -25,6 +25,7 @@ def seed_database(session: Session):
     seed_tables(session)
     seed_reservations(session)
     
+    # The steps only flush, so the whole seed is written in a single transaction
     session.commit()
 
 def seed_categories(session: Session):
@@ -43,10 +44,8 @@ def seed_categories(session: Session):
         MenuCategory(name="Beverages", description="Refreshing drinks and traditional Indian beverages", display_order=6),
     ]
     
-    for category in categories:
-        session.add(category)
-    
-    session.commit()
+    session.add_all(categories)
+    session.flush()
 
 def seed_ingredients(session: Session):
     """
@@ -81,10 +80,8 @@ def seed_ingredients(session: Session):
         Ingredient(name="Tea Leaves", description="Black tea leaves", allergen=False),
     ]
     
-    for ingredient in ingredients:
-        session.add(ingredient)
-    
-    session.commit()
+    session.add_all(ingredients)
+    session.flush()
 
 def seed_dietary_restrictions(session: Session):
     """
@@ -120,10 +117,8 @@ def seed_dietary_restrictions(session: Session):
         ),
     ]
     
-    for restriction in restrictions:
-        session.add(restriction)
-    
-    session.commit()
+    session.add_all(restrictions)
+    session.flush()
 
 def seed_menu_items(session: Session):
     """
@@ -319,10 +314,8 @@ def seed_menu_items(session: Session):
         ),
     ]
     
-    for item in menu_items:
-        session.add(item)
-    
-    session.commit()
+    session.add_all(menu_items)
+    session.flush()
 
 def seed_menu_item_ingredients(session: Session):
     """
@@ -469,10 +462,8 @@ def seed_menu_item_ingredients(session: Session):
         ),
     ]
     
-    for item_ingredient in menu_item_ingredients:
-        session.add(item_ingredient)
-    
-    session.commit()
+    session.add_all(menu_item_ingredients)
+    session.flush()
 
 def seed_menu_item_dietary_restrictions(session: Session):
     """
@@ -606,10 +597,8 @@ def seed_menu_item_dietary_restrictions(session: Session):
         ),
     ]
     
-    for item_restriction in menu_item_restrictions:
-        session.add(item_restriction)
-    
-    session.commit()
+    session.add_all(menu_item_restrictions)
+    session.flush()
 
 def seed_special_pricing(session: Session):
     """
@@ -652,10 +641,8 @@ def seed_special_pricing(session: Session):
         ),
     ]
     
-    for pricing in special_pricing:
-        session.add(pricing)
-    
-    session.commit()
+    session.add_all(special_pricing)
+    session.flush()
 
 def seed_tables(session: Session):
     """
@@ -673,10 +660,8 @@ def seed_tables(session: Session):
         RestaurantTable(table_number="6", capacity=4, location="Patio"),
     ]
     
-    for table in tables:
-        session.add(table)
-    
-    session.commit()
+    session.add_all(tables)
+    session.flush()
 
 def seed_reservations(session: Session):
     """
@@ -731,7 +716,5 @@ def seed_reservations(session: Session):
         reservation.tables = assigned_tables
         reservations.append(reservation)
     
-    for reservation in reservations:
-        session.add(reservation)
-    
-    session.commit()
\ No newline at end of file
+    session.add_all(reservations)
+    session.flush()
\ No newline at end of file
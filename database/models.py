@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Enum, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Enum, Index, func
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
-from database.schema import DietaryRestrictionType, ReservationStatus
+from database.schema import DietaryRestrictionType, ReservationStatus, normalize_phone
 
 Base = declarative_base()
 
@@ -47,11 +47,12 @@ class MenuItem(Base):
     def __repr__(self):
         return f"<MenuItem(id={self.id}, name='{self.name}', price={self.price})>"
     
-    def get_current_price(self):
+    def get_current_price(self, now=None):
         """Get the current price, taking into account any active special pricing."""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         for special in self.special_prices:
-            if special.active and special.start_date <= now <= special.end_date:
+            if special.is_active(now):
                 return special.special_price
         return self.price
     
@@ -139,9 +140,10 @@ class SpecialPricing(Base):
     def __repr__(self):
         return f"<SpecialPricing(id={self.id}, menu_item_id={self.menu_item_id}, price={self.special_price})>"
     
-    def is_active(self):
-        """Check if the special pricing is currently active."""
-        now = datetime.now()
+    def is_active(self, now=None):
+        """Check if the special pricing is active at `now` (defaults to the current time)."""
+        if now is None:
+            now = datetime.now()
         return self.active and self.start_date <= now <= self.end_date
 
 
@@ -152,6 +154,7 @@ class Reservation(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     customer_name = Column(String(100), nullable=False)
     customer_phone = Column(String(20), nullable=False)
+    customer_phone_norm = Column(String(20), index=True)
     customer_email = Column(String(100))
     party_size = Column(Integer, nullable=False)
     reservation_date = Column(DateTime, nullable=False)
@@ -162,6 +165,16 @@ class Reservation(Base):
     
     tables = relationship("RestaurantTable", secondary="reservation_tables", back_populates="reservations")
     
+    __table_args__ = (
+        Index("ix_reservations_date_phone", "reservation_date", "customer_phone"),
+    )
+    
+    @validates("customer_phone")
+    def _sync_phone_norm(self, key, phone):
+        """Keep the digits-only phone column in step with customer_phone."""
+        self.customer_phone_norm = normalize_phone(phone)
+        return phone
+    
     def __repr__(self):
         return f"<Reservation(id={self.id}, name='{self.customer_name}', date='{self.reservation_date}')>"
     
@@ -1,15 +1,18 @@
-from typing import List, Optional, Dict, Any, Type, TypeVar, Generic, Union
+from typing import List, Optional, Dict, Any, Iterator, Set, Type, TypeVar, Generic, Union
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func, select
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from sqlalchemy import Integer, and_, or_, desc, func, select, inspect, text
 from database.models import (
-    Base, MenuCategory, MenuItem, Ingredient, DietaryRestriction,
+    normalize_phone, Base, MenuCategory, MenuItem, Ingredient, DietaryRestriction,
     SpecialPricing, Reservation, RestaurantTable, DietaryRestrictionType,
     ReservationStatus
 )
 
 T = TypeVar('T', bound=Base) # type: ignore
 
+# Engines whose SQLite database is known to have the menu item FTS index
+_menu_item_fts_engines: Set[Any] = set()
+
 class Repository(Generic[T]):
     """Base repository class for database operations."""
     
@@ -34,7 +37,10 @@ class Repository(Generic[T]):
         Returns:
             Entity object or None if not found
         """
-        return self.session.query(self.model).filter(self.model.id == entity_id).first()
+        if entity_id is None:
+            return None
+        # Served from the session's identity map without SQL when already loaded
+        return self.session.get(self.model, entity_id)
     
     def get_all(self) -> List[T]:
         """
@@ -99,9 +105,27 @@ class Repository(Generic[T]):
 class MenuCategoryRepository(Repository[MenuCategory]):
     """Repository for menu categories."""
     
+    # Bumped on every write so in-process category caches know to refresh
+    version = 0
+    
     def __init__(self, session: Session):
         super().__init__(session, MenuCategory)
     
+    def create(self, **kwargs) -> MenuCategory:
+        entity = super().create(**kwargs)
+        MenuCategoryRepository.version += 1
+        return entity
+    
+    def update(self, entity_id: int, **kwargs) -> Optional[MenuCategory]:
+        entity = super().update(entity_id, **kwargs)
+        MenuCategoryRepository.version += 1
+        return entity
+    
+    def delete(self, entity_id: int) -> bool:
+        deleted = super().delete(entity_id)
+        MenuCategoryRepository.version += 1
+        return deleted
+    
     def get_by_name(self, name: str) -> Optional[MenuCategory]:
         """
         Get category by name.
@@ -122,6 +146,23 @@ class MenuCategoryRepository(Repository[MenuCategory]):
             Ordered list of categories
         """
         return self.session.query(self.model).order_by(self.model.display_order).all()
+    
+    def iter_ordered_categories(self, batch_size: int = 100) -> Iterator[MenuCategory]:
+        """
+        Stream categories ordered by display_order.
+        
+        Args:
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator over ordered categories
+        """
+        stmt = (
+            select(self.model)
+            .order_by(self.model.display_order)
+            .execution_options(yield_per=batch_size)
+        )
+        return self.session.execute(stmt).scalars()
 
 
 class MenuItemRepository(Repository[MenuItem]):
@@ -132,15 +173,42 @@ class MenuItemRepository(Repository[MenuItem]):
     
     def get_by_category(self, category_id: int) -> List[MenuItem]:
         """
-        Get menu items by category.
+        Get menu items by category, with their special pricing and dietary restrictions loaded.
         
         Args:
             category_id: Category ID
-            
+        
         Returns:
             List of menu items in the category
         """
-        return self.session.query(self.model).filter(self.model.category_id == category_id).all()
+        return (
+            self.session.query(self.model)
+            .options(
+                selectinload(self.model.special_prices),
+                selectinload(self.model.dietary_restrictions)
+            )
+            .filter(self.model.category_id == category_id)
+            .all()
+        )
+    
+    def get_by_ids(self, item_ids: List[int]) -> List[MenuItem]:
+        """
+        Get menu items by ID in a single query, with their special pricing loaded.
+        
+        Args:
+            item_ids: Menu item IDs
+            
+        Returns:
+            List of matching menu items
+        """
+        if not item_ids:
+            return []
+        return (
+            self.session.query(self.model)
+            .options(selectinload(self.model.special_prices))
+            .filter(self.model.id.in_(set(item_ids)))
+            .all()
+        )
     
     def get_available_items(self) -> List[MenuItem]:
         """
@@ -162,29 +230,147 @@ class MenuItemRepository(Repository[MenuItem]):
     
     def search_by_name(self, search_term: str) -> List[MenuItem]:
         """
-        Search menu items by name.
+        Search menu items by name, with their category and special pricing loaded.
         
         Args:
             search_term: Search term
-            
+        
         Returns:
             List of matching menu items
         """
-        search_pattern = f"%{search_term}%"
-        return self.session.query(self.model).filter(self.model.name.ilike(search_pattern)).all()
+        return (
+            self.session.query(self.model)
+            .options(selectinload(self.model.category), selectinload(self.model.special_prices))
+            .filter(self._name_matches(search_term))
+            .all()
+        )
+    
+    def _name_matches(self, search_term: str):
+        """Build a filter criterion matching item names that contain the search term."""
+        # The trigram index only matches terms of three or more characters
+        if len(search_term) >= 3 and self._has_name_fts():
+            phrase = '"' + search_term.replace('"', '""') + '"'
+            matching_ids = text(
+                "SELECT rowid FROM menu_items_fts WHERE menu_items_fts MATCH :phrase"
+            ).bindparams(phrase=phrase).columns(id=Integer)
+            return self.model.id.in_(matching_ids.scalar_subquery())
+        
+        return self.model.name.ilike(f"%{search_term}%")
+    
+    def list_flat(
+        self,
+        category_id: Optional[int] = None,
+        search_term: Optional[str] = None,
+        restriction_type: Optional[DietaryRestrictionType] = None
+    ) -> List[Any]:
+        """
+        List menu items as flat rows joined with their category.
+        
+        The current price (active special price, else regular price) is
+        computed in SQL, so no ORM objects or relationships are loaded.
+        
+        Args:
+            category_id: Only include items in this category
+            search_term: Only include items whose name contains this term
+            restriction_type: Only include items with this dietary restriction
+            
+        Returns:
+            Rows with id, name, description, price and category fields
+        """
+        return self._flat_query(category_id, search_term, restriction_type).all()
+    
+    def iter_flat(
+        self,
+        category_id: Optional[int] = None,
+        search_term: Optional[str] = None,
+        restriction_type: Optional[DietaryRestrictionType] = None,
+        batch_size: int = 100
+    ) -> Iterator[Any]:
+        """
+        Stream the rows of list_flat, fetching them from the database in batches.
+        
+        Args:
+            category_id: Only include items in this category
+            search_term: Only include items whose name contains this term
+            restriction_type: Only include items with this dietary restriction
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator over rows with id, name, description, price and category fields
+        """
+        return self._flat_query(category_id, search_term, restriction_type).yield_per(batch_size)
+    
+    def _flat_query(
+        self,
+        category_id: Optional[int],
+        search_term: Optional[str],
+        restriction_type: Optional[DietaryRestrictionType]
+    ) -> Query:
+        """Build the ordered flat menu item query shared by list_flat and iter_flat."""
+        now = datetime.now()
+        special_price = (
+            select(SpecialPricing.special_price)
+            .where(
+                SpecialPricing.menu_item_id == MenuItem.id,
+                SpecialPricing.active == True,
+                SpecialPricing.start_date <= now,
+                SpecialPricing.end_date >= now
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        
+        query = (
+            self.session.query(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.description,
+                func.coalesce(special_price, MenuItem.price).label("price"),
+                MenuCategory.name.label("category")
+            )
+            .join(MenuItem.category)
+        )
+        
+        if category_id is not None:
+            query = query.filter(MenuItem.category_id == category_id)
+        if search_term:
+            query = query.filter(self._name_matches(search_term))
+        if restriction_type is not None:
+            query = (
+                query.join(MenuItem.dietary_restrictions)
+                .filter(DietaryRestriction.restriction_type == restriction_type)
+            )
+        
+        return query.order_by(MenuItem.id)
+    
+    def _has_name_fts(self) -> bool:
+        """Check whether the bound SQLite database has the menu item FTS index."""
+        bind = self.session.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        
+        engine = getattr(bind, "engine", bind)
+        if engine in _menu_item_fts_engines:
+            return True
+        # Only a hit is cached, so an index created later (e.g. by init_db) is picked up
+        if not inspect(bind).has_table("menu_items_fts"):
+            return False
+        _menu_item_fts_engines.add(engine)
+        return True
     
     def get_by_dietary_restriction(self, restriction_type: DietaryRestrictionType) -> List[MenuItem]:
         """
-        Get menu items by dietary restriction.
+        Get menu items by dietary restriction, with their category and special pricing loaded.
         
         Args:
             restriction_type: Dietary restriction type
-            
+        
         Returns:
             List of menu items with the given dietary restriction
         """
         return (
             self.session.query(self.model)
+            .options(selectinload(self.model.category), selectinload(self.model.special_prices))
             .join(MenuItem.dietary_restrictions)
             .filter(DietaryRestriction.restriction_type == restriction_type)
             .all()
@@ -244,6 +430,7 @@ class SpecialPricingRepository(Repository[SpecialPricing]):
         now = datetime.now()
         return (
             self.session.query(self.model)
+            .options(joinedload(self.model.menu_item))
             .filter(
                 self.model.active == True,
                 self.model.start_date <= now,
@@ -297,9 +484,31 @@ class ReservationRepository(Repository[Reservation]):
     def __init__(self, session: Session):
         super().__init__(session, Reservation)
     
+    def recent(self, since: Optional[datetime] = None, limit: int = 500) -> Query:
+        """
+        Get the latest reservations, newest first, streamed in batches.
+        
+        Args:
+            since: Only include reservations on or after this date
+            limit: Maximum number of reservations to return
+            
+        Returns:
+            Query yielding reservations with their tables preloaded
+        """
+        query = self.session.query(self.model).options(selectinload(self.model.tables))
+        if since is not None:
+            query = query.filter(self.model.reservation_date >= since)
+        
+        return (
+            query
+            .order_by(self.model.reservation_date.desc())
+            .limit(limit)
+            .yield_per(200)
+        )
+    
     def get_by_phone(self, phone: str) -> List[Reservation]:
         """
-        Get reservations by phone number.
+        Get reservations by phone number, ignoring formatting.
         
         Args:
             phone: Phone number
@@ -309,7 +518,7 @@ class ReservationRepository(Repository[Reservation]):
         """
         return (
             self.session.query(self.model)
-            .filter(self.model.customer_phone == phone)
+            .filter(self.model.customer_phone_norm == normalize_phone(phone))
             .all()
         )
     
@@ -1,11 +1,25 @@
 from sqlalchemy import (
     MetaData, Table, Column, Integer, String, Float, 
-    DateTime, Boolean, ForeignKey, Text, Enum, CheckConstraint
+    DateTime, Boolean, ForeignKey, Text, Enum, CheckConstraint, Index
 )
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import func
 import enum
+import logging
+import re
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
+_NON_DIGITS = re.compile(r"\D")
+
+def normalize_phone(phone):
+    """Strip everything but digits from a phone number."""
+    if phone is None:
+        return None
+    return _NON_DIGITS.sub("", phone)
+
 metadata = MetaData()
 
 class DietaryRestrictionType(enum.Enum):
@@ -119,6 +133,7 @@ reservations = Table(
     Column("id", Integer, primary_key=True, autoincrement=True),
     Column("customer_name", String(100), nullable=False),
     Column("customer_phone", String(20), nullable=False),
+    Column("customer_phone_norm", String(20), index=True),
     Column("customer_email", String(100)),
     Column("party_size", Integer, nullable=False),
     Column("reservation_date", DateTime, nullable=False),
@@ -128,6 +143,7 @@ reservations = Table(
     Column("updated_at", DateTime, default=func.now(), onupdate=func.now()),
     CheckConstraint("party_size > 0", name="ck_reservation_party_size_positive"),
     CheckConstraint("reservation_date > created_at", name="ck_reservation_future_date"),
+    Index("ix_reservations_date_phone", "reservation_date", "customer_phone"),
 )
 
 restaurant_tables = Table(
@@ -151,10 +167,94 @@ reservation_tables = Table(
     Column("created_at", DateTime, default=func.now()),
 )
 
+# Bookkeeping stored alongside the data, e.g. the fingerprint of the schema init_db created
+schema_meta = Table(
+    "schema_meta",
+    metadata,
+    Column("key", String(50), primary_key=True),
+    Column("value", String(64), nullable=False),
+)
+
+# SQLite: trigram FTS5 index over menu item names, kept in sync by triggers
+SQLITE_MENU_ITEM_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts
+    USING fts5(name, content='menu_items', content_rowid='id', tokenize='trigram')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_ai AFTER INSERT ON menu_items BEGIN
+        INSERT INTO menu_items_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_ad AFTER DELETE ON menu_items BEGIN
+        INSERT INTO menu_items_fts(menu_items_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_au AFTER UPDATE OF name ON menu_items BEGIN
+        INSERT INTO menu_items_fts(menu_items_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO menu_items_fts(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+]
+
+def create_search_index(engine):
+    """Create the SQLite full-text search index for menu item names; other backends keep using ILIKE."""
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            is_new = not inspect(conn).has_table("menu_items_fts")
+            for statement in SQLITE_MENU_ITEM_SEARCH_DDL:
+                conn.execute(text(statement))
+            if is_new:
+                # Index rows that were inserted before the triggers existed
+                conn.execute(text("INSERT INTO menu_items_fts(menu_items_fts) VALUES ('rebuild')"))
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not create menu item search index: {str(e)}")
+
+def upgrade_reservations(engine):
+    """
+    Add and backfill reservations.customer_phone_norm on databases created before it existed.
+    
+    create_all never alters an existing table, so the column, the reservation
+    indexes and the normalized values are applied here. Safe to run on every init.
+    """
+    with engine.begin() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("reservations")}
+        if "customer_phone_norm" not in columns:
+            logger.info("Adding reservations.customer_phone_norm column")
+            conn.execute(text("ALTER TABLE reservations ADD COLUMN customer_phone_norm VARCHAR(20)"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_reservations_customer_phone_norm "
+            "ON reservations (customer_phone_norm)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_reservations_date_phone "
+            "ON reservations (reservation_date, customer_phone)"
+        ))
+        
+        rows = conn.execute(text(
+            "SELECT id, customer_phone FROM reservations "
+            "WHERE customer_phone_norm IS NULL AND customer_phone IS NOT NULL"
+        )).all()
+        if rows:
+            conn.execute(
+                text("UPDATE reservations SET customer_phone_norm = :phone_norm WHERE id = :id"),
+                [{"id": row.id, "phone_norm": normalize_phone(row.customer_phone)} for row in rows]
+            )
+            logger.info(f"Backfilled customer_phone_norm for {len(rows)} reservations")
+
 def create_tables(engine):
-    """Create all tables in the database."""
+    """Create all tables in the database and bring older ones up to date."""
     metadata.create_all(engine)
+    upgrade_reservations(engine)
+    create_search_index(engine)
 
 def drop_tables(engine):
     """Drop all tables from the database."""
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS menu_items_fts"))
     metadata.drop_all(engine)
\ No newline at end of file
@@ -1,7 +1,10 @@
 import os
 import sys
 import cmd
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
@@ -16,6 +19,44 @@ from database.repository import (
     ReservationRepository, RestaurantTableRepository
 )
 
+_ITEM_ROW_FMT = "{:<5} {:<30} ${:<9.2f}\n".format
+
+OUTPUT_CHUNK_ROWS = 100
+
+def write_rows(rows, chunk_size=OUTPUT_CHUNK_ROWS):
+    """Write pre-formatted rows to stdout, flushing every `chunk_size` rows."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            sys.stdout.write("".join(chunk))
+            sys.stdout.flush()
+            chunk = []
+    if chunk:
+        sys.stdout.write("".join(chunk))
+    sys.stdout.flush()
+
+CATEGORY_CACHE_TTL = 60.0
+
+# (cached_at, repository version, [(id, name, description), ...])
+_category_cache = (0.0, -1, None)
+
+def cached_categories(session, ttl=CATEGORY_CACHE_TTL):
+    """Return ordered categories, reusing the last result for up to `ttl` seconds."""
+    global _category_cache
+    cached_at, version, data = _category_cache
+    if (
+        data is not None
+        and version == MenuCategoryRepository.version
+        and time.monotonic() - cached_at < ttl
+    ):
+        return data
+    
+    repo = MenuCategoryRepository(session)
+    data = [(c.id, c.name, c.description) for c in repo.iter_ordered_categories()]
+    _category_cache = (time.monotonic(), MenuCategoryRepository.version, data)
+    return data
+
 class DatabaseExplorer(cmd.Cmd):
     """Interactive database explorer."""
     
@@ -32,9 +73,31 @@ Type 'exit' or 'quit' to exit.
     def __init__(self):
         """Initialize the database explorer."""
         super().__init__()
+        self._dispatch = {
+            name[3:]: getattr(self, name)
+            for name in self.get_names()
+            if name.startswith("do_")
+        }
+        self._completions = list(self._dispatch)
         init_db()
         print("Database initialized successfully.")
     
+    def onecmd(self, line):
+        """Dispatch a command through the precomputed command table."""
+        command, arg, line = self.parseline(line)
+        handler = self._dispatch.get(command) if command else None
+        if handler is None:
+            return super().onecmd(line)
+        
+        self.lastcmd = line
+        if line == "EOF":
+            self.lastcmd = ""
+        return handler(arg)
+    
+    def completenames(self, text, *ignored):
+        """Complete command names from the precomputed command list."""
+        return [name for name in self._completions if name.startswith(text)]
+    
     def do_exit(self, arg):
         """Exit the explorer."""
         return True
@@ -46,13 +109,12 @@ Type 'exit' or 'quit' to exit.
     def do_categories(self, arg):
         """List all menu categories."""
         with db_session() as session:
-            repo = MenuCategoryRepository(session)
-            categories = repo.get_ordered_categories()
+            categories = cached_categories(session)
             
             print("\nMenu Categories:")
             print("-" * 50)
-            for category in categories:
-                print(f"{category.id}: {category.name} - {category.description}")
+            for category_id, name, description in categories:
+                print(f"{category_id}: {name} - {description}")
     
     def do_items(self, arg):
         """List menu items, optionally by category ID."""
@@ -62,7 +124,7 @@ Type 'exit' or 'quit' to exit.
             if arg:
                 try:
                     category_id = int(arg)
-                    items = repo.get_by_category(category_id)
+                    items = repo.iter_flat(category_id=category_id)
                     cat_repo = MenuCategoryRepository(session)
                     category = cat_repo.get_by_id(category_id)
                     print(f"\nMenu Items in Category '{category.name}':")
@@ -70,16 +132,12 @@ Type 'exit' or 'quit' to exit.
                     print(f"Invalid category ID: {arg}")
                     return
             else:
-                items = repo.get_all()
+                items = repo.iter_flat()
                 print("\nAll Menu Items:")
             
-            print("-" * 50)
-            print(f"{'ID':<5} {'Name':<30} {'Price':<10}")
-            print("-" * 50)
+            print(f"{'-' * 50}\n{'ID':<5} {'Name':<30} {'Price':<10}\n{'-' * 50}")
             
-            for item in items:
-                price = item.get_current_price()
-                print(f"{item.id:<5} {item.name:<30} ${price:<9.2f}")
+            write_rows(_ITEM_ROW_FMT(item.id, item.name, item.price) for item in items)
     
     def do_search(self, arg):
         """Search menu items by name."""
@@ -89,7 +147,7 @@ Type 'exit' or 'quit' to exit.
         
         with db_session() as session:
             repo = MenuItemRepository(session)
-            items = repo.search_by_name(arg)
+            items = repo.list_flat(search_term=arg)
             
             print(f"\nSearch Results for '{arg}':")
             print("-" * 50)
@@ -98,9 +156,12 @@ Type 'exit' or 'quit' to exit.
                 print("No items found.")
                 return
             
-            for item in items:
-                price = item.get_current_price()
-                print(f"{item.id}: {item.name} (${price:.2f}), Category: {item.category.name}")
+            lines = [
+                f"{item.id}: {item.name} (${item.price:.2f}), Category: {item.category}"
+                for item in items
+            ]
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.write("\n")
     
     def do_dietary(self, arg):
         """List items by dietary restriction type."""
@@ -117,7 +178,7 @@ Type 'exit' or 'quit' to exit.
         with db_session() as session:
             repo = MenuItemRepository(session)
             restriction_type = DietaryRestrictionType(arg)
-            items = repo.get_by_dietary_restriction(restriction_type)
+            items = repo.list_flat(restriction_type=restriction_type)
             
             print(f"\n{arg.capitalize()} Menu Items:")
             print("-" * 50)
@@ -126,9 +187,12 @@ Type 'exit' or 'quit' to exit.
                 print("No items found.")
                 return
             
-            for item in items:
-                price = item.get_current_price()
-                print(f"{item.name} (${price:.2f}) - {item.description[:40]}...")
+            lines = [
+                f"{item.name} (${item.price:.2f}) - {item.description[:40]}..."
+                for item in items
+            ]
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.write("\n")
     
     def do_specials(self, arg):
         """List active special pricing."""
@@ -143,10 +207,20 @@ Type 'exit' or 'quit' to exit.
                 print("No active specials found.")
                 return
             
-            for special in specials:
-                item = special.menu_item
-                print(f"{item.name}: ${special.special_price:.2f} (regular: ${item.price:.2f})")
-                print(f"  {special.description}, valid until {special.end_date.strftime('%Y-%m-%d')}")
+            count = len(specials)
+            regular = np.fromiter((s.menu_item.price for s in specials), dtype=np.float64, count=count)
+            special_prices = np.fromiter((s.special_price for s in specials), dtype=np.float64, count=count)
+            savings = regular - special_prices
+            savings_pct = savings / regular * 100.0
+            
+            lines = []
+            for special, reg, price, saved, pct in zip(specials, regular, special_prices, savings, savings_pct):
+                lines.append(
+                    f"{special.menu_item.name}: ${price:.2f} (regular: ${reg:.2f}, save ${saved:.2f} / {pct:.1f}%)"
+                )
+                lines.append(f"  {special.description}, valid until {special.end_date.strftime('%Y-%m-%d')}")
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.write("\n")
     
     def do_reservations(self, arg):
         """List reservations, optionally by phone number."""
@@ -157,19 +231,24 @@ Type 'exit' or 'quit' to exit.
                 reservations = repo.get_by_phone(arg)
                 print(f"\nReservations for phone number {arg}:")
             else:
-                reservations = repo.get_all()
-                print("\nAll Reservations:")
+                since = datetime.now() - timedelta(days=30)
+                reservations = repo.recent(since=since)
+                print(f"\nReservations dated {since.strftime('%Y-%m-%d')} or later:")
             
             print("-" * 50)
             
-            if not reservations:
-                print("No reservations found.")
-                return
-            
+            lines = []
             for r in reservations:
                 date_str = r.reservation_date.strftime("%Y-%m-%d %H:%M")
                 tables = ", ".join([t.table_number for t in r.tables])
-                print(f"ID: {r.id}, {r.customer_name}, {date_str}, {r.status.value}, Tables: {tables}")
+                lines.append(f"ID: {r.id}, {r.customer_name}, {date_str}, {r.status.value}, Tables: {tables}")
+            
+            if not lines:
+                print("No reservations found.")
+                return
+            
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.write("\n")
     
     def do_help(self, arg):
         """List available commands with help text."""
@@ -1,6 +1,6 @@
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
@@ -87,6 +87,21 @@ def test_search_menu():
         for item in items:
             print(f"  - {item['name']} (${item['price']:.2f}): {item['description']}")
 
+def test_search_by_name_index():
+    """Test that indexed name search matches a plain substring scan."""
+    print_separator("Search by Name (Index)")
+    # Two-character terms fall back to ILIKE; longer ones go through the FTS index when present
+    with db_session() as session:
+        repo = MenuItemRepository(session)
+        for search_term in ("ch", "Chi", "chicken", "paneer", "xyz"):
+            found = sorted(item.id for item in repo.search_by_name(search_term))
+            expected = sorted(
+                item.id for item in session.query(MenuItem).filter(MenuItem.name.ilike(f"%{search_term}%"))
+            )
+            status = "OK" if found == expected else "MISMATCH"
+            print(f"  - '{search_term}': {len(found)} items ({status})")
+            assert found == expected, f"search_by_name('{search_term}') returned {found}, expected {expected}"
+
 def test_dietary_restrictions():
     """Test fetching items by dietary restriction."""
     print_separator("Items by Dietary Restriction")
@@ -134,8 +149,8 @@ def test_order_calculation():
 def test_reservation_availability():
     """Test reservation availability."""
     print_separator("Reservation Availability")
-    tomorrow = datetime.now()
-    date_str = f"{tomorrow.year}-{tomorrow.month:02d}-{tomorrow.day+1:02d}"
+    tomorrow = datetime.now() + timedelta(days=1)
+    date_str = tomorrow.strftime("%Y-%m-%d")
     time_str = "19:00"
     party_size = 4
     
@@ -161,8 +176,8 @@ def test_reservation_availability():
 def test_make_reservation():
     """Test making a reservation."""
     print_separator("Make Reservation")
-    tomorrow = datetime.now()
-    date_str = f"{tomorrow.year}-{tomorrow.month:02d}-{tomorrow.day+1:02d}"
+    tomorrow = datetime.now() + timedelta(days=1)
+    date_str = tomorrow.strftime("%Y-%m-%d")
     time_str = "18:00"
     
     with db_session() as session:
@@ -194,6 +209,7 @@ def main():
     test_menu_categories()
     test_menu_items()
     test_search_menu()
+    test_search_by_name_index()
     test_dietary_restrictions()
     test_special_pricing()
     test_order_calculation()
@@ -0,0 +1,28 @@
+"""
+Shared pooled HTTP session for the local infrastructure scripts.
+
+The session is built on first use so --help and argument errors never
+import requests.
+"""
+import atexit
+
+_session = None
+
+def get_session():
+    """Return the shared pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        _session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, read=False, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        atexit.register(_session.close)
+    return _session
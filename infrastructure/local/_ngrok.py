@@ -0,0 +1,75 @@
+"""
+Shared ngrok tunnel lookup for the local infrastructure scripts.
+
+The public URL is cached on disk for a short time so that running the
+deployment check and the end-to-end tests back to back only queries the
+local ngrok API once.
+"""
+import os
+import json
+import time
+import socket
+from urllib.request import urlopen
+from pathlib import Path
+
+NGROK_API_URL = "http://localhost:4040/api/tunnels"
+NGROK_API_ADDRESS = ("localhost", 4040)
+NGROK_PROBE_TIMEOUT = 0.05
+NGROK_CACHE_PATH = Path.home() / ".cache" / "voiceagent" / "ngrok_url.json"
+NGROK_CACHE_TTL = 30
+
+def is_ngrok_running(timeout=NGROK_PROBE_TIMEOUT):
+    """Probe the local ngrok API port with a short TCP connect."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        return s.connect_ex(NGROK_API_ADDRESS) == 0
+
+def get_ngrok_url():
+    """Get the ngrok public URL from the local ngrok API."""
+    # Skip the HTTP request entirely when nothing listens on the API port
+    if not is_ngrok_running():
+        return None
+    
+    # A single localhost request, so the standard library is enough; callers need no HTTP client
+    try:
+        with urlopen(NGROK_API_URL, timeout=1.0) as response:
+            tunnels = json.load(response)["tunnels"]
+        for tunnel in tunnels:
+            if tunnel["proto"] == "https":
+                return tunnel["public_url"]
+        return None
+    except Exception:
+        return None
+
+def _read_cache(ttl):
+    """Return the cached URL if it is younger than `ttl` seconds."""
+    try:
+        with open(NGROK_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if time.time() - data["ts"] < ttl:
+            return data["url"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _write_cache(url):
+    """Atomically store the URL with the current timestamp."""
+    try:
+        NGROK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = NGROK_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "ts": time.time()}, f)
+        os.replace(tmp_path, NGROK_CACHE_PATH)
+    except OSError:
+        pass
+
+def cached_ngrok_url(ttl=NGROK_CACHE_TTL):
+    """Get the ngrok public URL, reusing a recent lookup when available."""
+    url = _read_cache(ttl)
+    if url:
+        return url
+    
+    url = get_ngrok_url()
+    if url:
+        _write_cache(url)
+    return url
@@ -10,93 +10,124 @@ import sys
 import json
 import time
 import argparse
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
-def check_health(base_url):
+from _http import get_session
+from _ngrok import cached_ngrok_url
+
+# (connect, read) timeout for every request, and an overall bound for all checks
+HTTP_TIMEOUT = (3.0, 10.0)
+CHECKS_TIMEOUT = 30
+
+# Checks run concurrently, so each one reports its lines in a single locked print
+_print_lock = threading.Lock()
+
+def report(*lines):
+    """Print a check's output as one uninterrupted block."""
+    with _print_lock:
+        print("\n".join(lines))
+
+def report_failure(check_name, error):
+    """Report a failed check, calling out timeouts separately."""
+    from requests.exceptions import Timeout
+    
+    if isinstance(error, Timeout):
+        report(f"⏱️ {check_name} check timed out")
+    else:
+        report(f"❌ {check_name} check failed: {str(error)}")
+
+def check_health(base_url, session=None):
     """Check the health endpoint."""
+    if session is None:
+        session = get_session()
+    
     try:
-        response = requests.get(f"{base_url}/health")
+        response = session.get(f"{base_url}/health", timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         health_data = response.json()
         
-        print(f"✅ Health check successful")
-        print(f"   Status: {health_data['status']}")
-        print(f"   Version: {health_data['version']}")
-        print(f"   Environment: {health_data['environment']}")
+        report(
+            f"✅ Health check successful",
+            f"   Status: {health_data['status']}",
+            f"   Version: {health_data['version']}",
+            f"   Environment: {health_data['environment']}"
+        )
         return True
     except Exception as e:
-        print(f"❌ Health check failed: {str(e)}")
+        report_failure("Health", e)
         return False
 
-def check_metrics(base_url):
+def check_metrics(base_url, session=None):
     """Check the metrics endpoint."""
+    if session is None:
+        session = get_session()
+    
     try:
-        response = requests.get(f"{base_url}/metrics")
+        response = session.get(f"{base_url}/metrics", timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         metrics_data = response.json()
         
-        print(f"✅ Metrics check successful")
-        print(f"   Uptime: {metrics_data['uptime']:.2f} seconds")
-        print(f"   Memory usage: {metrics_data['memory_usage']:.2f} MB")
-        print(f"   CPU usage: {metrics_data['cpu_usage']:.2f}%")
+        report(
+            f"✅ Metrics check successful",
+            f"   Uptime: {metrics_data['uptime']:.2f} seconds",
+            f"   Memory usage: {metrics_data['memory_usage']:.2f} MB",
+            f"   CPU usage: {metrics_data['cpu_usage']:.2f}%"
+        )
         return True
     except Exception as e:
-        print(f"❌ Metrics check failed: {str(e)}")
+        report_failure("Metrics", e)
         return False
 
-def check_admin_config(base_url):
+def check_admin_config(base_url, session=None):
     """Check the admin config endpoint."""
+    if session is None:
+        session = get_session()
+    
     try:
-        response = requests.get(f"{base_url}/admin/config")
+        response = session.get(f"{base_url}/admin/config", timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         config_data = response.json()
         
-        print(f"✅ Admin config check successful")
-        print(f"   Found {len(config_data)} configuration items")
+        report(
+            f"✅ Admin config check successful",
+            f"   Found {len(config_data)} configuration items"
+        )
         return True
     except Exception as e:
-        print(f"❌ Admin config check failed: {str(e)}")
+        report_failure("Admin config", e)
         return False
 
-def check_twilio_endpoints(base_url):
+def is_twiml(response):
+    """Check the raw response body looks like TwiML, without decoding it."""
+    body = response.content
+    return body.find(b"<?xml") != -1 and body.find(b"<Response>") != -1
+
+def check_twilio_endpoints(base_url, session=None):
     """Check the Twilio webhook endpoints."""
+    if session is None:
+        session = get_session()
+    
     try:
-        # Try health and readiness endpoints
-        fallback_response = requests.post(f"{base_url}/webhook/fallback")
-        voice_response = requests.post(f"{base_url}/webhook/voice")
+        # Try fallback and voice endpoints, overlapping the two round-trips
+        urls = [f"{base_url}/webhook/fallback", f"{base_url}/webhook/voice"]
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            responses = list(executor.map(lambda url: session.post(url, timeout=HTTP_TIMEOUT), urls))
         
         # Check if responses are valid TwiML
-        is_valid_twiml = (
-            '<?xml' in fallback_response.text and 
-            '<Response>' in fallback_response.text and
-            '<?xml' in voice_response.text and 
-            '<Response>' in voice_response.text
-        )
+        is_valid_twiml = all(is_twiml(response) for response in responses)
         
         if is_valid_twiml:
-            print(f"✅ Twilio webhook endpoints check successful")
+            report(f"✅ Twilio webhook endpoints check successful")
             return True
         else:
-            print(f"❌ Twilio webhook endpoints returned invalid TwiML")
+            report(f"❌ Twilio webhook endpoints returned invalid TwiML")
             return False
     except Exception as e:
-        print(f"❌ Twilio webhook endpoints check failed: {str(e)}")
+        report_failure("Twilio webhook endpoints", e)
         return False
 
-def get_ngrok_url():
-    """Get the ngrok public URL."""
-    try:
-        response = requests.get("http://localhost:4040/api/tunnels")
-        response.raise_for_status()
-        tunnels = response.json()["tunnels"]
-        for tunnel in tunnels:
-            if tunnel["proto"] == "https":
-                return tunnel["public_url"]
-        return None
-    except Exception:
-        return None
-
 def main():
     parser = argparse.ArgumentParser(description="Check deployment of Voice AI Restaurant Agent")
     parser.add_argument("--url", help="Base URL of the deployed application", default=None)
@@ -106,29 +137,49 @@ def main():
     base_url = args.url
     if not base_url:
         print("No URL provided, trying to get ngrok URL...")
-        base_url = get_ngrok_url()
+        base_url = cached_ngrok_url()
     
     if not base_url:
         print("❌ Could not determine application URL. Please provide it with --url or ensure ngrok is running.")
         sys.exit(1)
     
-    print(f"🔍 Checking deployment at {base_url}")
-    print("=" * 50)
+    print(f"🔍 Checking deployment at {base_url}\n{'=' * 50}")
+    
+    # Run checks concurrently; they are independent HTTP probes sharing one session
+    session = get_session()
+    checks = [
+        ("health", check_health),
+        ("metrics", check_metrics),
+        ("admin", check_admin_config),
+        ("twilio", check_twilio_endpoints),
+    ]
+    results = {name: False for name, _ in checks}
+    timed_out = False
     
-    # Run checks
-    health_ok = check_health(base_url)
-    metrics_ok = check_metrics(base_url)
-    admin_ok = check_admin_config(base_url)
-    twilio_ok = check_twilio_endpoints(base_url)
+    # Not a with-block: leaving one would wait for a hung check and defeat CHECKS_TIMEOUT
+    executor = ThreadPoolExecutor(max_workers=len(checks))
+    futures = {executor.submit(check, base_url, session): name for name, check in checks}
+    try:
+        for future in as_completed(futures, timeout=CHECKS_TIMEOUT):
+            results[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        timed_out = True
+        pending = [name for future, name in futures.items() if not future.done()]
+        report(f"❌ Checks timed out after {CHECKS_TIMEOUT} seconds: {', '.join(pending)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # Overall status
-    print("=" * 50)
-    if all([health_ok, metrics_ok, admin_ok, twilio_ok]):
-        print("✅ All checks passed! Deployment is healthy.")
+    if all(results.values()):
+        print(f"{'=' * 50}\n✅ All checks passed! Deployment is healthy.")
         sys.exit(0)
-    else:
-        print("❌ Some checks failed. Please review the logs.")
-        sys.exit(1)
+    
+    print(f"{'=' * 50}\n❌ Some checks failed. Please review the logs.")
+    if timed_out:
+        # sys.exit would still join the hung worker threads at interpreter shutdown
+        sys.stdout.flush()
+        os._exit(1)
+    sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
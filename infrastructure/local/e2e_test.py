@@ -6,16 +6,35 @@ This script conducts end-to-end tests against a deployed instance of the applica
 simulating Twilio voice API calls.
 """
 import os
+import re
 import sys
 import json
-import time
+import asyncio
 import argparse
-import requests
 import random
-import uuid
-import xml.etree.ElementTree as ET
+import secrets
 from datetime import datetime, timedelta
 
+from _ngrok import cached_ngrok_url
+
+# Async client settings for the simulated conversations
+HTTP_MAX_CONNECTIONS = 32
+HTTP_KEEPALIVE_EXPIRY = 60
+HTTP_CONNECT_TIMEOUT = 3.0
+HTTP_READ_TIMEOUT = 10.0
+
+# Delay between turns: "off" for CI, "realtime" for demos, "adaptive" scales with server latency
+PACING_MODES = ("off", "realtime", "adaptive")
+REALTIME_TURN_DELAY = 0.5
+
+def turn_delay(pacing, last_elapsed):
+    """Seconds to wait before the next turn, given the last response time."""
+    if pacing == "realtime":
+        return REALTIME_TURN_DELAY
+    if pacing == "adaptive":
+        return min(REALTIME_TURN_DELAY, 0.1 * last_elapsed)
+    return 0.0
+
 # Test cases for simulating conversations
 TEST_CONVERSATIONS = [
     # Menu inquiry flow
@@ -43,27 +62,30 @@ TEST_CONVERSATIONS = [
     ]
 ]
 
-def parse_twiml(twiml_text):
-    """Parse TwiML response and extract key information."""
+# Opening tags of the TwiML verbs the tests look at
+TWIML_TAG_RE = re.compile(rb"<(Say|Record|Gather|Hangup)\b")
+
+def parse_twiml(twiml_body):
+    """Parse TwiML response bytes and extract key information.
+    
+    Verb presence comes from a regex scan of the raw body; the XML tree is only
+    built when there is <Say> text to extract.
+    """
+    import xml.etree.ElementTree as ET
+    
     try:
-        root = ET.fromstring(twiml_text)
-        say_elements = root.findall(".//Say")
-        say_texts = [say.text for say in say_elements if say.text]
-        
-        record_elements = root.findall(".//Record")
-        has_record = len(record_elements) > 0
-        
-        gather_elements = root.findall(".//Gather")
-        has_gather = len(gather_elements) > 0
+        tags = {match.group(1) for match in TWIML_TAG_RE.finditer(twiml_body)}
         
-        hangup_elements = root.findall(".//Hangup")
-        has_hangup = len(hangup_elements) > 0
+        say_texts = []
+        if b"Say" in tags:
+            root = ET.fromstring(twiml_body)
+            say_texts = [element.text for element in root.iter("Say") if element.text]
         
         return {
             "say_texts": say_texts,
-            "has_record": has_record,
-            "has_gather": has_gather,
-            "has_hangup": has_hangup
+            "has_record": b"Record" in tags,
+            "has_gather": b"Gather" in tags,
+            "has_hangup": b"Hangup" in tags
         }
     except Exception as e:
         print(f"Error parsing TwiML: {e}")
@@ -74,39 +96,44 @@ def parse_twiml(twiml_text):
             "has_hangup": False
         }
 
-def simulate_call(base_url, conversation):
+async def simulate_call(client, base_url, conversation, label="", pacing="off"):
     """Simulate a complete conversation flow."""
-    print(f"Simulating conversation with {len(conversation)} turns")
+    import httpx
+    
+    def log(message):
+        print(f"{label}{message}")
+    
+    log(f"Simulating conversation with {len(conversation)} turns")
     
     # Generate a unique call SID for this test
-    call_sid = f"TEST{uuid.uuid4().hex[:16].upper()}"
+    call_sid = f"TEST{secrets.token_hex(8).upper()}"
     
     # Start the call
-    print("\n📞 Initiating call...")
+    log("📞 Initiating call...")
     
     try:
         # Call the voice webhook to start
-        response = requests.post(
+        response = await client.post(
             f"{base_url}/webhook/voice",
             data={"CallSid": call_sid, "From": "+15551234567", "To": "+15559876543"}
         )
         response.raise_for_status()
         
         # Parse the initial TwiML
-        twiml_info = parse_twiml(response.text)
+        twiml_info = parse_twiml(response.content)
         if twiml_info["say_texts"]:
-            print(f"🤖 Agent: {twiml_info['say_texts'][0]}")
+            log(f"🤖 Agent: {twiml_info['say_texts'][0]}")
         
         # Go through each turn in the conversation
         for i, user_message in enumerate(conversation):
-            print(f"\n👤 User: {user_message}")
+            log(f"👤 User: {user_message}")
             
             # Simulate recording URL
             recording_url = f"https://example.com/recordings/{call_sid}/{i}"
-            recording_sid = f"RE{uuid.uuid4().hex[:16].upper()}"
+            recording_sid = f"RE{secrets.token_hex(8).upper()}"
             
             # Call the transcribe webhook
-            response = requests.post(
+            response = await client.post(
                 f"{base_url}/webhook/transcribe",
                 data={
                     "CallSid": call_sid,
@@ -118,58 +145,77 @@ def simulate_call(base_url, conversation):
             response.raise_for_status()
             
             # Parse the TwiML response
-            twiml_info = parse_twiml(response.text)
+            twiml_info = parse_twiml(response.content)
             
             # Display the agent's response
             if twiml_info["say_texts"]:
-                print(f"🤖 Agent: {twiml_info['say_texts'][0]}")
+                log(f"🤖 Agent: {twiml_info['say_texts'][0]}")
             
             # Check if the call has ended
             if twiml_info["has_hangup"]:
-                print("📞 Call ended by agent")
+                log("📞 Call ended by agent")
                 break
             
-            # Small delay to simulate real-time conversation
-            time.sleep(0.5)
+            # Optional delay to simulate real-time conversation
+            delay = turn_delay(pacing, response.elapsed.total_seconds())
+            if delay > 0:
+                await asyncio.sleep(delay)
         
         # End the call (send status callback)
-        requests.post(
+        await client.post(
             f"{base_url}/webhook/status",
             data={"CallSid": call_sid, "CallStatus": "completed"}
         )
         
-        print("\n✅ Conversation simulation completed successfully")
+        log("✅ Conversation simulation completed successfully")
         return True
         
+    except httpx.TimeoutException as e:
+        log(f"⏱️ Conversation simulation timed out: {type(e).__name__}")
+        return False
     except Exception as e:
-        print(f"\n❌ Error during conversation simulation: {str(e)}")
+        log(f"❌ Error during conversation simulation: {str(e)}")
         return False
 
-def run_tests(base_url, num_tests=1):
-    """Run multiple conversation tests."""
-    successful = 0
-    failed = 0
+async def _run_conversations(base_url, test_cases, concurrency, pacing="off"):
+    """Drive the test conversations, at most `concurrency` at a time."""
+    import httpx
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
     
+    timeout = httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        async def run_one(i, conversation):
+            async with semaphore:
+                return await simulate_call(client, base_url, conversation, label=f"[#{i+1}] ", pacing=pacing)
+        
+        return await asyncio.gather(*(run_one(i, c) for i, c in enumerate(test_cases)))
+
+def select_conversations(num_tests, seed=None):
+    """Pick distinct conversations first, repeating only when more are requested."""
+    rng = random.Random(seed)
+    test_cases = rng.sample(TEST_CONVERSATIONS, min(num_tests, len(TEST_CONVERSATIONS)))
+    if num_tests > len(test_cases):
+        test_cases.extend(rng.choices(TEST_CONVERSATIONS, k=num_tests - len(test_cases)))
+    return test_cases
+
+def run_tests(base_url, num_tests=1, concurrency=1, seed=None, pacing="off"):
+    """Run multiple conversation tests."""
     # Select random conversations for testing
-    test_cases = random.choices(TEST_CONVERSATIONS, k=num_tests)
+    test_cases = select_conversations(num_tests, seed)
     
-    print(f"Running {num_tests} test conversation(s) against {base_url}")
+    print(f"Running {num_tests} test conversation(s) against {base_url} ({concurrency} concurrent)")
     print("=" * 60)
     
-    for i, conversation in enumerate(test_cases):
-        print(f"\nTest #{i+1}/{num_tests}")
-        print("-" * 40)
-        
-        if simulate_call(base_url, conversation):
-            successful += 1
-        else:
-            failed += 1
-        
-        print("-" * 40)
-        
-        # Add delay between tests
-        if i < len(test_cases) - 1:
-            time.sleep(2)
+    results = asyncio.run(_run_conversations(base_url, test_cases, max(1, concurrency), pacing))
+    successful = sum(results)
+    failed = len(results) - successful
     
     # Print summary
     print("\n" + "=" * 60)
@@ -181,28 +227,23 @@ def main():
     parser = argparse.ArgumentParser(description="Run end-to-end tests for Voice AI Restaurant Agent")
     parser.add_argument("--url", help="Base URL of the deployed application", default=None)
     parser.add_argument("--tests", type=int, help="Number of test conversations to run", default=1)
+    parser.add_argument("--concurrency", type=int, help="Number of conversations to run in parallel", default=1)
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible conversation selection", default=None)
+    parser.add_argument("--pacing", choices=PACING_MODES, help="Delay between conversation turns", default="off")
     args = parser.parse_args()
     
     # Get base URL
     base_url = args.url
     if not base_url:
         # Try to get ngrok URL
-        try:
-            response = requests.get("http://localhost:4040/api/tunnels")
-            tunnels = response.json()["tunnels"]
-            for tunnel in tunnels:
-                if tunnel["proto"] == "https":
-                    base_url = tunnel["public_url"]
-                    break
-        except Exception:
-            pass
+        base_url = cached_ngrok_url()
     
     if not base_url:
         print("❌ Could not determine application URL. Please provide it with --url or ensure ngrok is running.")
         sys.exit(1)
     
     # Run tests
-    success = run_tests(base_url, args.tests)
+    success = run_tests(base_url, args.tests, args.concurrency, args.seed, args.pacing)
     
     if success:
         print("✅ All tests passed successfully!")
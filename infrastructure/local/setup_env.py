@@ -7,9 +7,46 @@ This script helps set up the environment variables needed for local deployment.
 import os
 import sys
 import argparse
+import shutil
 import secrets
-import subprocess
 from pathlib import Path
+from functools import lru_cache
+
+@lru_cache()
+def is_installed(executable):
+    """Check whether an executable is on PATH without spawning it."""
+    return shutil.which(executable) is not None
+
+# Prompts for .env keys that need a real value: key -> (prompt, default)
+ENV_PROMPTS = {
+    "OPENAI_API_KEY": ("Enter your OpenAI API key (leave empty for mock): ", "dummy_key_for_local_development"),
+    "OPENAIORG_ID": ("Enter your OpenAI Organization ID (leave empty if not needed): ", ""),
+    "TWILIO_API_KEY": ("Enter your Twilio API Key (leave empty for mock): ", "dummy_key_for_local_development"),
+    "TWILIO_API_SECRET": ("Enter your Twilio API Secret (leave empty for mock): ", "dummy_secret_for_local_development"),
+    "NGROK_AUTHTOKEN": ("Enter your ngrok auth token (leave empty for basic use): ", ""),
+}
+
+def _transform_env_lines(lines):
+    """Yield .env lines from .env.example lines, prompting for placeholder values."""
+    for line in lines:
+        # Skip empty lines and comments
+        if not line.strip() or line.strip().startswith("#"):
+            yield line
+            continue
+        
+        # Handle lines with equals sign
+        if "=" in line:
+            ending = "\n" if line.endswith("\n") else ""
+            key, value = line.rstrip("\r\n").split("=", 1)
+            # Generate values for empty or placeholder fields
+            if key in ENV_PROMPTS and ("dummy" in value.lower() or "your" in value.lower() or not value.strip()):
+                prompt, default = ENV_PROMPTS[key]
+                value = input(prompt).strip() or default
+            yield f"{key}={value}{ending}"
+        else:
+            # Add lines without equals sign as-is (might be malformed, but preserve them)
+            print(f"Warning: Line without '=' found in .env.example: '{line.rstrip()}'")
+            yield line
 
 def generate_env_file(env_file_path, overwrite=False):
     """Generate .env file from .env.example with configured values."""
@@ -28,51 +65,20 @@ def generate_env_file(env_file_path, overwrite=False):
         print(f"❌ {env_example_path} not found.")
         return False
     
-    # Read .env.example
-    with open(env_example_path, "r") as f:
-        env_example = f.read()
+    # Answer every prompt before opening .env, so an interrupted run leaves the old file intact
+    with open(env_example_path, "r") as f_in:
+        lines = list(_transform_env_lines(f_in))
     
-    # Generate values for empty fields
-    env_lines = []
-    for line in env_example.splitlines():
-        # Skip empty lines and comments
-        if not line.strip() or line.strip().startswith("#"):
-            env_lines.append(line)
-            continue
-            
-        # Handle lines with equals sign
-        if "=" in line:
-            key, value = line.split("=", 1)
-            # Generate values for empty or placeholder fields
-            if "dummy" in value.lower() or "your" in value.lower() or not value.strip():
-                if key == "OPENAI_API_KEY":
-                    value = input("Enter your OpenAI API key (leave empty for mock): ").strip() or "dummy_key_for_local_development"
-                elif key == "OPENAIORG_ID":
-                    value = input("Enter your OpenAI Organization ID (leave empty if not needed): ").strip() or ""
-                elif key == "TWILIO_API_KEY":
-                    value = input("Enter your Twilio API Key (leave empty for mock): ").strip() or "dummy_key_for_local_development"
-                elif key == "TWILIO_API_SECRET":
-                    value = input("Enter your Twilio API Secret (leave empty for mock): ").strip() or "dummy_secret_for_local_development"
-                elif key == "NGROK_AUTHTOKEN":
-                    value = input("Enter your ngrok auth token (leave empty for basic use): ").strip() or ""
-            env_lines.append(f"{key}={value}")
-        else:
-            # Add lines without equals sign as-is (might be malformed, but preserve them)
-            print(f"Warning: Line without '=' found in .env.example: '{line}'")
-            env_lines.append(line)
-    
-    # Write .env file
-    with open(env_file_path, "w") as f:
-        f.write("\n".join(env_lines))
+    with open(env_file_path, "w") as f_out:
+        f_out.writelines(lines)
     
     print(f"✅ Generated {env_file_path}")
     return True
 
 def setup_ngrok():
     """Check and help setup ngrok."""
-    try:
-        # Check if ngrok is installed
-        subprocess.run(["ngrok", "version"], check=True, stdout=subprocess.PIPE)
+    # Check if ngrok is installed
+    if is_installed("ngrok"):
         print("✅ ngrok is installed")
         
         # Check for ngrok auth token
@@ -87,7 +93,7 @@ def setup_ngrok():
                     print("  You can still use ngrok, but with limitations.")
                     print("  To get an auth token, register at https://ngrok.com/")
                     print("  Then add NGROK_AUTHTOKEN=your_token to your .env file")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         print("❌ ngrok is not installed or not in PATH")
         print("  To install ngrok, visit https://ngrok.com/download")
         print("  For Mac users with Homebrew: brew install ngrok")
@@ -95,30 +101,28 @@ def setup_ngrok():
 
 def check_docker():
     """Check if Docker and Docker Compose are installed."""
-    try:
-        # Check Docker
-        subprocess.run(["docker", "--version"], check=True, stdout=subprocess.PIPE)
+    # Check Docker, then Docker Compose
+    if is_installed("docker"):
         print("✅ Docker is installed")
         
-        # Check Docker Compose
-        subprocess.run(["docker-compose", "--version"], check=True, stdout=subprocess.PIPE)
-        print("✅ Docker Compose is installed")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ Docker or Docker Compose is not installed or not in PATH")
-        print("  To install Docker, visit https://docs.docker.com/get-docker/")
-        print("  Docker Compose is usually included with Docker Desktop")
-        return False
+        if is_installed("docker-compose"):
+            print("✅ Docker Compose is installed")
+            return True
+    
+    print("❌ Docker or Docker Compose is not installed or not in PATH")
+    print("  To install Docker, visit https://docs.docker.com/get-docker/")
+    print("  Docker Compose is usually included with Docker Desktop")
+    return False
 
 def create_storage_dirs():
     """Create necessary storage directories."""
     storage_dir = Path("storage")
-    audio_dir = storage_dir / "audio"
-    transcript_dir = storage_dir / "transcripts"
+    subdirs = ("audio", "transcripts")
     
-    for directory in [storage_dir, audio_dir, transcript_dir]:
-        directory.mkdir(exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+    # parents=True creates storage/ itself on the first call
+    for sub in subdirs:
+        (storage_dir / sub).mkdir(parents=True, exist_ok=True)
+    print(f"✅ Created directories: {', '.join(str(storage_dir / sub) for sub in subdirs)}")
 
 def main():
     parser = argparse.ArgumentParser(description="Setup environment for Voice AI Restaurant Agent")
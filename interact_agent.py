@@ -1,21 +1,108 @@
 import sys
 import os
+import time
+import shelve
+import asyncio
+import hashlib
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
+from collections import Counter
+
+LOG_LEVEL = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler(sys.stdout)]
 )
+# SQL statement logging is only useful when explicitly debugging
+logging.getLogger("sqlalchemy.engine").setLevel(
+    logging.INFO if LOG_LEVEL <= logging.DEBUG else logging.WARNING
+)
 
 project_root = Path(__file__).parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from database import init_db, db_session
-from app.core.agent import RestaurantAgent
+
+# Response cache location. Keys cover the agent's settings and the conversation so far
+RESPONSE_CACHE_PATH = ".agent_cache.db"
+
+# Menu, pricing and reservation data are not part of the key, and cached replies can
+# mention opening hours, specials or availability, so they expire
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+
+# Conversation logs are written through a large buffer and flushed on errors and at exit
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Upper bound on agent calls in flight when answering --query batches
+QUERY_CONCURRENCY = 10
+
+def agent_fingerprint(agent):
+    """
+    Hash the agent settings that shape its replies: model, temperature and system prompt.
+    
+    Used as the first link of the response cache key chain. Settings the agent
+    does not expose are left out, so only the TTL limits how long replies that
+    depend on them are reused.
+    """
+    system_prompt = next(
+        (message.get("content") for message in agent_history(agent) or []
+         if isinstance(message, dict) and message.get("role") == "system"),
+        None
+    )
+    material = f"{getattr(agent, 'model', None)}|{getattr(agent, 'temperature', None)}|{system_prompt}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def response_cache_key(previous_key, user_input):
+    """Build a cache key chained on the previous turn so replies stay tied to the conversation so far."""
+    material = f"{previous_key}|{user_input}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def cache_get(cache, key):
+    """Return the cached reply for key, or None if it is missing or older than RESPONSE_CACHE_TTL."""
+    entry = cache.get(key) if cache is not None else None
+    if not isinstance(entry, tuple):
+        return None
+    stored_at, response = entry
+    if time.time() - stored_at > RESPONSE_CACHE_TTL:
+        return None
+    return response
+
+def cache_put(cache, key, response):
+    """Store a reply together with the time it was produced."""
+    if cache is not None:
+        cache[key] = (time.time(), response)
+
+def agent_history(agent):
+    """Return the agent's OpenAI-style message list, or None if it does not expose one."""
+    messages = getattr(agent, "messages", None)
+    return messages if isinstance(messages, list) else None
+
+def used_tools(messages):
+    """Check whether any of the given messages is a tool call or a tool result."""
+    for message in messages:
+        if not isinstance(message, dict):
+            # SDK message objects come from the model, so check them the same way
+            message = {"role": getattr(message, "role", None), "tool_calls": getattr(message, "tool_calls", None)}
+        if message.get("role") == "tool" or message.get("tool_calls"):
+            return True
+    return False
+
+def is_cacheable_turn(agent, history_start):
+    """
+    Decide whether the turn the agent just answered may be cached.
+    
+    Turns that called tools (menu lookups, reservations) are never cached,
+    because replaying them would skip the tool's side effects. When the agent
+    does not expose its history the turn cannot be checked, so it is not cached.
+    """
+    history = agent_history(agent)
+    if history is None:
+        return False
+    return not used_tools(history[history_start:])
 
 def print_header():
     """Print welcome header."""
@@ -37,27 +124,52 @@ def print_help():
     print("  - Do you have parking?")
     print("  - Where are you located?")
 
-def interactive_session():
-    """Run an interactive session with the agent."""
+def interactive_session(cache_mode="disabled", log_enabled=True, log_dir="."):
+    """Run an interactive session with the agent.
+    
+    cache_mode is one of "disabled" (the default; always call the agent),
+    "enabled" (read and write cached replies) or "replay" (only serve cached
+    replies, never call the agent). Cache hits are added to the agent's history
+    so later turns still see them.
+    When log_enabled is False the conversation is not written to disk.
+    """
+    # Imported here so --help does not pay for the database and agent import graph
+    from database import init_db, db_session
+    from app.core.agent import RestaurantAgent
+    
     print_header()
     print_help()
     
-    # Create a log file with timestamp in filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"conversation_{timestamp}.txt"
-    log_file = open(log_filename, "w", encoding="utf-8")
+    # Create a log file with timestamp in filename (or discard writes when logging is off)
+    if log_enabled:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        log_filename = str(Path(log_dir) / f"conversation_{timestamp}.txt")
+        log_file = open(log_filename, "w", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+    else:
+        log_filename = None
+        log_file = open(os.devnull, "w", encoding="utf-8")
     
     # Write header to log file
     log_file.write("=== Voice AI Restaurant Agent Conversation Log ===\n")
     log_file.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
     
     print(f"\nInitializing the database and agent...")
-    print(f"Conversation will be logged to: {log_filename}")
+    if log_filename:
+        print(f"Conversation will be logged to: {log_filename}")
     init_db()
     
+    cache = shelve.open(RESPONSE_CACHE_PATH) if cache_mode != "disabled" else None
+    
+    # Session counters (cache_hits, cache_misses, llm_calls, errors) and time spent
+    stats = Counter()
+    t_llm_total = t_cache_total = 0.0
+    
     try:
         with db_session() as session:
             agent = RestaurantAgent(session)
+            # Advanced only for turns whose reply was shown, so it tracks what the agent has seen
+            cache_key = agent_fingerprint(agent)
             
             print("\nAgent is ready! You can start chatting now.\n")
             
@@ -81,9 +193,36 @@ def interactive_session():
                     if not user_input:
                         continue
                     
-                    print("\nProcessing your request...")
-                    response = agent.process_message(user_input)
+                    t0 = time.perf_counter()
+                    turn_key = response_cache_key(cache_key, user_input)
+                    response = cache_get(cache, turn_key)
+                    t_cache_total += time.perf_counter() - t0
+                    
+                    if response is not None:
+                        stats["cache_hits"] += 1
+                        # Keep the agent's view of the conversation in step with what was shown
+                        history = agent_history(agent)
+                        if history is not None:
+                            history.append({"role": "user", "content": user_input})
+                            history.append({"role": "assistant", "content": response})
+                    elif cache_mode == "replay":
+                        stats["cache_misses"] += 1
+                        print("\nNo cached response for this message (replay mode).")
+                        log_file.write("(No cached response in replay mode)\n")
+                        continue
+                    else:
+                        stats["cache_misses"] += 1
+                        print("\nProcessing your request...")
+                        history = agent_history(agent)
+                        history_start = len(history) if history is not None else 0
+                        t0 = time.perf_counter()
+                        response = agent.process_message(user_input)
+                        t_llm_total += time.perf_counter() - t0
+                        stats["llm_calls"] += 1
+                        if cache is not None and is_cacheable_turn(agent, history_start):
+                            cache_put(cache, turn_key, response)
                     
+                    cache_key = turn_key
                     print(f"\nPriya: {response}")
                     
                     # Log agent response
@@ -92,18 +231,121 @@ def interactive_session():
                 except KeyboardInterrupt:
                     print("\n\nSession terminated by user. Goodbye!")
                     log_file.write("\n\nSession terminated by user. Goodbye!\n")
+                    log_file.flush()
                     break
                 except Exception as e:
+                    stats["errors"] += 1
                     error_message = f"\nError: {str(e)}"
                     print(error_message)
                     log_file.write(f"{error_message}\n")
                     print("Let's continue our conversation.")
                     log_file.write("Let's continue our conversation.\n")
+                    log_file.flush()
     finally:
-        # Write footer and close log file
+        if cache is not None:
+            cache.close()
+        
+        lookups = stats["cache_hits"] + stats["cache_misses"]
+        stats_line = (
+            f"[stats] {dict(stats)} "
+            f"llm_avg_ms={1000 * t_llm_total / max(1, stats['llm_calls']):.1f} "
+            f"cache_avg_ms={1000 * t_cache_total / max(1, lookups):.2f}"
+        )
+        print(f"\n{stats_line}")
+        
+        # Write stats, footer and close log file
+        log_file.write(f"\n{stats_line}\n")
         log_file.write(f"\nEnded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         log_file.close()
-        print(f"\nConversation log saved to: {log_filename}")
+        if log_filename:
+            print(f"\nConversation log saved to: {log_filename}")
+
+async def _answer_queries(queries, concurrency):
+    """Answer queries concurrently, each on its own agent and database session.
+    
+    Each result is a (reply, cacheable) pair, or the exception the query raised.
+    """
+    from database import db_session
+    from app.core.agent import RestaurantAgent
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    def ask(query):
+        with db_session() as session:
+            agent = RestaurantAgent(session)
+            history = agent_history(agent)
+            history_start = len(history) if history is not None else 0
+            return agent.process_message(query), is_cacheable_turn(agent, history_start)
+    
+    async def run_one(query):
+        async with semaphore:
+            return await asyncio.to_thread(ask, query)
+    
+    return await asyncio.gather(*(run_one(q) for q in queries), return_exceptions=True)
+
+def answer_queries(queries, concurrency=QUERY_CONCURRENCY, cache_mode="disabled"):
+    """Answer one-off queries in parallel and print the replies in order.
+    
+    Duplicate queries are collapsed and sent to the agent once. With the
+    cache enabled, each query is a fresh conversation, so its cache key is
+    chained directly on the agent's fingerprint. Unexpired cached replies are
+    served directly, and replies from turns that called tools are never stored.
+    """
+    from database import init_db, db_session
+    from app.core.agent import RestaurantAgent
+    
+    init_db()
+    root_key = ""
+    if cache_mode != "disabled":
+        with db_session() as session:
+            root_key = agent_fingerprint(RestaurantAgent(session))
+    
+    cache = shelve.open(RESPONSE_CACHE_PATH) if cache_mode != "disabled" else None
+    try:
+        keys = [response_cache_key(root_key, query) for query in queries]
+        replies = {key: reply for key in keys if (reply := cache_get(cache, key)) is not None}
+        
+        pending = {key: query for key, query in zip(keys, queries) if key not in replies}
+        if pending and cache_mode != "replay":
+            results = asyncio.run(_answer_queries(list(pending.values()), concurrency))
+            for key, result in zip(pending, results):
+                if isinstance(result, Exception):
+                    replies[key] = result
+                    continue
+                replies[key], cacheable = result
+                if cacheable:
+                    cache_put(cache, key, replies[key])
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    responses = [replies.get(key, LookupError("No cached response (replay mode)")) for key in keys]
+    for query, response in zip(queries, responses):
+        print(f"\nYou: {query}")
+        if isinstance(response, Exception):
+            print(f"Error: {str(response)}")
+        else:
+            print(f"Priya: {response}")
 
 if __name__ == "__main__":
-    interactive_session()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Chat with the restaurant agent from the terminal")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--cache", action="store_true", help="Reuse and store replies for turns that did not call tools")
+    cache_group.add_argument("--replay", action="store_true", help="Only answer from cached replies")
+    parser.add_argument("--log", action=argparse.BooleanOptionalAction, default=True, help="Write the conversation to a log file")
+    parser.add_argument("--session-log", metavar="DIR", default=".", help="Directory for conversation log files")
+    parser.add_argument("-q", "--query", action="append", help="Answer this query and exit (repeatable; queries run in parallel)")
+    args = parser.parse_args()
+    
+    if args.cache:
+        mode = "enabled"
+    elif args.replay:
+        mode = "replay"
+    else:
+        mode = "disabled"
+    
+    if args.query:
+        answer_queries(args.query, cache_mode=mode)
+        sys.exit(0)
+    
+    interactive_session(cache_mode=mode, log_enabled=args.log, log_dir=args.session_log)
\ No newline at end of file
@@ -1,13 +1,13 @@
 ﻿from database import init_db, db_session
+from sqlalchemy import func
 from database.models import MenuCategory
 
 print('Initializing database...')
 init_db()
 
 with db_session() as session:
-    categories = session.query(MenuCategory).all()
-    print(f"Found {len(categories)} menu categories:")
-    for category in categories:
-        print(f"- {category.name}")
+    count = session.query(func.count(MenuCategory.id)).scalar()
+    names = [name for (name,) in session.query(MenuCategory.name).order_by(MenuCategory.id).yield_per(50)]
+    print("\n".join([f"Found {count} menu categories:"] + [f"- {name}" for name in names]))
 
 print("Database initialization complete!")
@@ -1,30 +1,61 @@
 import requests
-import uuid
-import xml.etree.ElementTree as ET
+import secrets
+import time
+import atexit
+import asyncio
 import argparse
 import os
+import sys
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# lxml parses TwiML noticeably faster when installed; the stdlib parser is the fallback
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 load_dotenv()
 
-def parse_twiml(twiml_text):
-    """Parse TwiML response and extract key information for Media Streams."""
+# Environment settings are read once at import rather than on every request
+ACCOUNT_SID = os.environ.get("TWILIO_SID_KEY", "AC" + "0" * 32)
+BASE_URL = os.environ.get("WEBHOOK_BASE_URL", "http://localhost:8000")
+VOICE_PATH = os.environ.get("VOICE_WEBHOOK_PATH", "/webhook/voice")
+STATUS_PATH = os.environ.get("STATUS_WEBHOOK_PATH", "/webhook/status")
+
+# Shared session so the voice and status webhook calls reuse one keep-alive connection.
+# Only connection failures are retried with backoff. Read timeouts and gateway errors
+# are not, since the server may already have acted on the webhook.
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "twilio-webhook-test/1"})
+_retry = Retry(total=3, read=False, backoff_factor=0.5, status_forcelist=())
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_retry)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+atexit.register(SESSION.close)
+
+def parse_twiml(twiml_body):
+    """Parse TwiML response bytes and extract key information for Media Streams."""
     try:
-        # Strip whitespace and normalize
-        twiml_text = twiml_text.strip()
-        
-        root = ET.fromstring(twiml_text)
-        
-        # Check for Media Streams elements
-        stream_elements = root.findall(".//Stream")
-        has_stream = len(stream_elements) > 0
-        
-        # Get Stream URLs
-        stream_urls = [stream.get("url") for stream in stream_elements if stream.get("url")]
+        # The body is parsed as received; copying it to strip whitespace is not needed
+        root = ET.fromstring(twiml_body)
         
-        # Check for Say elements
-        say_elements = root.findall(".//Say")
-        say_texts = [say.text for say in say_elements if say.text]
+        # Collect Stream and Say elements in one pass over the tree, ignoring any namespace
+        has_stream = False
+        stream_urls = []
+        say_texts = []
+        for element in root.iter():
+            if not isinstance(element.tag, str):
+                continue  # lxml comments and processing instructions
+            tag = element.tag.rpartition("}")[2]
+            if tag == "Stream":
+                has_stream = True
+                stream_url = element.get("url")
+                if stream_url:
+                    stream_urls.append(stream_url)
+            elif tag == "Say" and element.text:
+                say_texts.append(element.text)
         
         return {
             "has_stream": has_stream,
@@ -39,27 +70,29 @@ def parse_twiml(twiml_text):
             "say_texts": []
         }
 
+# Fields shared by every simulated inbound call; only the CallSid changes
+VOICE_CALL_TEMPLATE = {
+    "AccountSid": ACCOUNT_SID,
+    "From": "+15551234567",
+    "To": "+15559876543",
+    "CallStatus": "ringing",
+    "ApiVersion": "2010-04-01",
+    "Direction": "inbound"
+}
+
+def voice_call_data():
+    """Build the form data Twilio posts for a new inbound call."""
+    call_sid = f"TEST{secrets.token_hex(8).upper()}"
+    return call_sid, {"CallSid": call_sid, **VOICE_CALL_TEMPLATE}
+
 def test_voice_webhook(url):
     """Test the voice webhook for Media Streams approach."""
-    call_sid = f"TEST{uuid.uuid4().hex[:16].upper()}"
-    
-    account_sid = os.environ.get("TWILIO_SID_KEY", "AC00000000000000000000000000000000")
-    
-    # Prepare test data
-    data = {
-        "CallSid": call_sid,
-        "AccountSid": account_sid,
-        "From": "+15551234567",
-        "To": "+15559876543",
-        "CallStatus": "ringing",
-        "ApiVersion": "2010-04-01",
-        "Direction": "inbound"
-    }
+    call_sid, data = voice_call_data()
     
     print(f"Sending test request to: {url}")
     
     try:
-        response = requests.post(url, data=data, timeout=10)
+        response = SESSION.post(url, data=data, timeout=10)
         print(f"Full request data: {data}")
         
         if response.status_code == 200:
@@ -69,7 +102,7 @@ def test_voice_webhook(url):
             print(response.text)
             print("-" * 50)
             
-            twiml_info = parse_twiml(response.text)
+            twiml_info = parse_twiml(response.content)
             
             if twiml_info["has_stream"]:
                 print("✅ Response includes <Stream> element for Media Streams")
@@ -100,7 +133,7 @@ def test_status_webhook(url, call_sid):
     print(f"\nSending status update to: {url}")
     
     try:
-        response = requests.post(url, data=data, timeout=10)
+        response = SESSION.post(url, data=data, timeout=10)
         
         if response.status_code == 200:
             print("✅ Status webhook responded with status code 200")
@@ -112,20 +145,67 @@ def test_status_webhook(url, call_sid):
         print(f"❌ Error testing status webhook: {str(e)}")
         return False
 
+async def _load_test(url, num_calls, concurrency):
+    """Post num_calls voice webhooks with at most concurrency in flight."""
+    import httpx
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    # Connection failures are retried by the transport, mirroring the session's retry policy
+    transport = httpx.AsyncHTTPTransport(retries=3, limits=httpx.Limits(max_connections=concurrency))
+    
+    async def one_call(client):
+        _, data = voice_call_data()
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, data=data)
+                return response.status_code, time.perf_counter() - start
+            except httpx.HTTPError:
+                return None, time.perf_counter() - start
+    
+    async with httpx.AsyncClient(transport=transport, timeout=10, headers={"User-Agent": SESSION.headers["User-Agent"]}) as client:
+        return await asyncio.gather(*(one_call(client) for _ in range(num_calls)))
+
+def run_load_test(url, num_calls, concurrency):
+    """Fire concurrent voice webhook calls and print a latency summary."""
+    print(f"Sending {num_calls} voice webhook calls to {url} ({concurrency} concurrent)")
+    
+    start = time.perf_counter()
+    results = asyncio.run(_load_test(url, num_calls, concurrency))
+    wall_time = time.perf_counter() - start
+    
+    latencies = sorted(elapsed for status, elapsed in results if status == 200)
+    failures = len(results) - len(latencies)
+    
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"✅ {len(latencies)} calls succeeded in {wall_time:.2f}s (p50 {1000 * p50:.0f} ms, p95 {1000 * p95:.0f} ms)")
+    if failures:
+        print(f"❌ {failures} calls failed")
+    return failures == 0
+
 def main():
     parser = argparse.ArgumentParser(description="Test Twilio Media Streams webhook")
-    parser.add_argument("--url", default=os.environ.get("WEBHOOK_BASE_URL", "http://localhost:8000"), 
+    parser.add_argument("--url", default=BASE_URL, 
                         help="Base URL of the application")
-    parser.add_argument("--voice-path", default="/webhook/voice", 
+    parser.add_argument("--voice-path", default=VOICE_PATH, 
                         help="Path for the voice webhook")
-    parser.add_argument("--status-path", default="/webhook/status", 
+    parser.add_argument("--status-path", default=STATUS_PATH, 
                         help="Path for the status webhook")
+    parser.add_argument("--load", type=int, metavar="N", 
+                        help="Load test: send N voice webhook calls concurrently and exit")
+    parser.add_argument("--concurrency", type=int, default=20, 
+                        help="Maximum calls in flight during a load test")
     args = parser.parse_args()
     
     base_url = args.url.rstrip('/')
     voice_url = f"{base_url}{args.voice_path}"
     status_url = f"{base_url}{args.status_path}"
     
+    if args.load:
+        sys.exit(0 if run_load_test(voice_url, args.load, args.concurrency) else 1)
+    
     print("=========================================================")
     print("Voice AI Restaurant Agent - Media Streams Webhook Test")
     print("=========================================================")
@@ -2,22 +2,64 @@ import os
 import sys
 import argparse
 import json
+import types
 from datetime import datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 
-if os.path.exists(".env"):
-    load_dotenv()
+@lru_cache()
+def get_credentials():
+    """Load .env and read the Twilio credentials once, on first use rather than at import."""
+    # CI passes credentials through the real environment and sets SKIP_DOTENV=1 to skip parsing .env
+    if os.environ.get("SKIP_DOTENV") != "1" and os.path.exists(".env"):
+        load_dotenv()
+    
+    return types.SimpleNamespace(
+        api_key=os.environ.get("TWILIO_API_KEY", ""),
+        api_secret=os.environ.get("TWILIO_API_SECRET", ""),
+        sid=os.environ.get("TWILIO_SID_KEY", "")
+    )
+
+# Callback attributes shown for each phone number, with their display labels
+CALLBACK_LABELS = {
+    attr: attr.replace('_', ' ').title()
+    for attr in ('status_callback', 'voice_fallback_url', 'sms_fallback_url', 'voice_status_callback_url')
+}
+
+# Every phone number attribute read by explore_numbers
+WEBHOOK_ATTRS = ('voice_url', 'voice_method', 'sms_url', *CALLBACK_LABELS)
 
-TWILIO_API_KEY = os.environ.get("TWILIO_API_KEY", "")
-TWILIO_API_SECRET = os.environ.get("TWILIO_API_SECRET", "")
-TWILIO_SID_KEY = os.environ.get("TWILIO_SID_KEY", "") 
+# Account phone numbers, fetched once and shared by every helper that lists them
+_incoming_numbers = None
+
+# Largest page Twilio serves, so most accounts are listed in a single request
+NUMBERS_PAGE_SIZE = 1000
+
+def iter_incoming_numbers(client):
+    """Yield the account's incoming phone numbers, streaming them from Twilio on first use."""
+    global _incoming_numbers
+    if _incoming_numbers is not None:
+        yield from _incoming_numbers
+        return
+    
+    # Pages are printed as they arrive instead of after the whole list has loaded
+    numbers = []
+    for number in client.incoming_phone_numbers.stream(page_size=NUMBERS_PAGE_SIZE):
+        numbers.append(number)
+        yield number
+    _incoming_numbers = numbers
+
+def get_incoming_numbers(client):
+    """Return the account's incoming phone numbers, calling Twilio only on first use."""
+    return list(iter_incoming_numbers(client))
 
 def validate_credentials():
     """Validate that the Twilio credentials are properly set."""
+    creds = get_credentials()
     missing = []
-    if not TWILIO_API_KEY:
+    if not creds.api_key:
         missing.append("TWILIO_API_KEY")
-    if not TWILIO_API_SECRET:
+    if not creds.api_secret:
         missing.append("TWILIO_API_SECRET")
     
     if missing:
@@ -32,10 +74,11 @@ def test_twilio_client():
     try:
         from twilio.rest import Client
         
-        if TWILIO_SID_KEY:
-            client = Client(TWILIO_API_KEY, TWILIO_API_SECRET, TWILIO_SID_KEY)
+        creds = get_credentials()
+        if creds.sid:
+            client = Client(creds.api_key, creds.api_secret, creds.sid)
         else:
-            client = Client(TWILIO_API_KEY, TWILIO_API_SECRET)
+            client = Client(creds.api_key, creds.api_secret)
         
         print("✅ Successfully created Twilio client")
         return client
@@ -47,81 +90,60 @@ def test_twilio_client():
         print(f"❌ Failed to create Twilio client: {str(e)}")
         return None
 
-def explore_phone_numbers(client):
-    """Explore the phone numbers in the Twilio account."""
+def explore_numbers(client):
+    """Explore the phone numbers in the Twilio account and check their webhook settings."""
     if not client:
         return
     
     print("\n📞 Phone Numbers:")
+    webhook_blocks = []
     try:
-        incoming_numbers = client.incoming_phone_numbers.list()
-        if incoming_numbers:
-            for number in incoming_numbers:
-                print(f"Phone Number: {number.phone_number}")
-                print(f"  Friendly Name: {number.friendly_name}")
-                print(f"  SID: {number.sid}")
-                
-                if hasattr(number, 'voice_url') and number.voice_url:
-                    print(f"  Voice URL: {number.voice_url}")
-                if hasattr(number, 'sms_url') and number.sms_url:
-                    print(f"  SMS URL: {number.sms_url}")
-                
-                attrs_to_check = [
-                    'status_callback', 'voice_fallback_url', 
-                    'sms_fallback_url', 'voice_status_callback_url'
-                ]
-                
-                for attr in attrs_to_check:
-                    if hasattr(number, attr) and getattr(number, attr):
-                        print(f"  {attr.replace('_', ' ').title()}: {getattr(number, attr)}")
-                
-                print()
-        else:
+        for number in iter_incoming_numbers(client):
+            # Read every webhook attribute once and render both sections from it
+            values = {attr: getattr(number, attr, None) for attr in WEBHOOK_ATTRS}
+            
+            lines = [
+                f"Phone Number: {number.phone_number}",
+                f"  Friendly Name: {number.friendly_name}",
+                f"  SID: {number.sid}"
+            ]
+            if values['voice_url']:
+                lines.append(f"  Voice URL: {values['voice_url']}")
+            if values['sms_url']:
+                lines.append(f"  SMS URL: {values['sms_url']}")
+            for attr, label in CALLBACK_LABELS.items():
+                if values[attr]:
+                    lines.append(f"  {label}: {values[attr]}")
+            lines.append("")
+            print("\n".join(lines))
+            
+            lines = [f"Phone Number: {number.phone_number}"]
+            if values['voice_url']:
+                lines.append(f"  ✅ Voice URL: {values['voice_url']}")
+            else:
+                lines.append("  ❌ No Voice URL configured")
+            if values['voice_method']:
+                lines.append(f"  ✅ Voice Method: {values['voice_method']}")
+            if values['status_callback']:
+                lines.append(f"  ✅ Status Callback: {values['status_callback']}")
+            else:
+                lines.append("  ⚠️ No Status Callback configured")
+            lines.append("")
+            webhook_blocks.append("\n".join(lines))
+        
+        if not webhook_blocks:
             print("No phone numbers found in this account")
     except Exception as e:
         print(f"❌ Error retrieving phone numbers: {str(e)}")
-
-def check_webhook_url(number, attribute):
-    """Safely check for webhook URL attributes that might not exist."""
-    if hasattr(number, attribute):
-        return getattr(number, attribute)
-    return None
-
-def explore_webhook_settings(client):
-    """Explore the webhook settings for phone numbers."""
-    if not client:
         return
     
     print("\n🔄 Webhook Settings Check:")
-    try:
-        incoming_numbers = client.incoming_phone_numbers.list()
-        if not incoming_numbers:
-            print("No phone numbers found to check webhook settings")
-            return
-            
-        for number in incoming_numbers:
-            print(f"Phone Number: {number.phone_number}")
-            
-            voice_url = check_webhook_url(number, 'voice_url')
-            if voice_url:
-                print(f"  ✅ Voice URL: {voice_url}")
-            else:
-                print("  ❌ No Voice URL configured")
-            
-            voice_method = check_webhook_url(number, 'voice_method')
-            if voice_method:
-                print(f"  ✅ Voice Method: {voice_method}")
-            
-            status_callback = check_webhook_url(number, 'status_callback')
-            if status_callback:
-                print(f"  ✅ Status Callback: {status_callback}")
-            else:
-                print("  ⚠️ No Status Callback configured")
-            
-            print()
-            
-    except Exception as e:
-        print(f"❌ Error checking webhook settings: {str(e)}")
+    if not webhook_blocks:
+        print("No phone numbers found to check webhook settings")
+        return
+    
+    for block in webhook_blocks:
+        print(block)
 
 def configure_webhook(client, phone_number_sid, base_url):
     """Configure webhook URLs for a phone number."""
@@ -168,16 +190,14 @@ def main():
     if not client:
         return
     
-    explore_phone_numbers(client)
-    
-    explore_webhook_settings(client)
+    explore_numbers(client)
     
     if args.configure:
         if not args.phone:
             print("\nYou need to specify a phone number SID to configure webhooks")
             print("\nAvailable phone numbers:")
             try:
-                numbers = client.incoming_phone_numbers.list()
+                numbers = get_incoming_numbers(client)
                 for i, number in enumerate(numbers):
                     print(f"{i+1}. {number.phone_number} (SID: {number.sid})")
                 